@@ -5,6 +5,7 @@ from homeassistant.config_entries import ConfigEntry
 
 from .const import DOMAIN, PLATFORMS
 from .controller import FuktstyrningController
+from .coordinator import FuktstyrningCoordinator
 from .scheduler import Scheduler
 from .persistence import Persistence
 from .services import async_register_services
@@ -15,6 +16,8 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Fuktstyrning component."""
     hass.data.setdefault(DOMAIN, {})
+    # Services are domain-wide; entries are resolved per call
+    await async_register_services(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -25,29 +28,49 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     controller = FuktstyrningController(hass, entry)
     hass.data[DOMAIN][entry.entry_id] = {"controller": controller}
 
-    # 2) Initiera controller-logik
-    await controller.initialize()
+    try:
+        # 2) Initiera controller-logik
+        await controller.initialize()
 
-    # 3) Starta plattformar (sensor, switch, binary_sensor)
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        # Gemensam datakoordinator för sensorerna
+        coordinator = FuktstyrningCoordinator(hass, entry, controller)
+        await coordinator.async_refresh()
+        hass.data[DOMAIN][entry.entry_id]["coordinator"] = coordinator
+        entry.async_on_unload(coordinator.async_track_sources())
+        entry.async_on_unload(coordinator.async_track_schedule())
 
-    # 4) Ladda sparad inlärningsdata
-    persistence = Persistence(hass, entry.entry_id)
-    await persistence.load(controller)
-    # Attach persistence for shutdown
-    controller.persistence = persistence
+        # Ladda om när inställningarna ändras i options-flödet
+        entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
-    # 5) Starta periodisk schemaläggning
-    scheduler = Scheduler(hass, controller._update_schedule)
-    await scheduler.start()
-    # Attach scheduler for shutdown
-    controller.scheduler = scheduler
+        # 3) Starta plattformar (sensor, switch, binary_sensor)
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # 6) Registrera custom services
-    await async_register_services(hass, entry, controller)
+        # 4) Ladda sparad inlärningsdata
+        persistence = Persistence(hass, entry.entry_id)
+        await persistence.load(controller)
+        # Attach persistence for shutdown
+        controller.persistence = persistence
+
+        # 5) Starta periodisk schemaläggning
+        scheduler = Scheduler(hass, controller._update_schedule)
+        await scheduler.start()
+        # Attach scheduler for shutdown
+        controller.scheduler = scheduler
+    except Exception:
+        # Don't leave a half-built controller for the services to resolve
+        controller.release()
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        raise
+
+    # 6) Gör controllern nåbar för tjänsterna först när allt är uppsatt
+    controller.register()
 
     return True
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so changed options take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
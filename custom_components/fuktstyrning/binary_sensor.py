@@ -6,15 +6,16 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
     BINARY_SENSOR_OPTIMAL_RUNNING_UNIQUE_ID,
     BINARY_SENSOR_OPTIMAL_RUNNING_NAME,
 )
+from .coordinator import FuktstyrningCoordinator, FuktstyrningSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,33 +26,28 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Fuktstyrning binary sensor platform."""
-    controller = hass.data[DOMAIN][entry.entry_id]["controller"]
+    data = hass.data[DOMAIN][entry.entry_id]
     
     entities = [
-        OptimalRunningBinarySensor(hass, entry, controller),
+        OptimalRunningBinarySensor(data["coordinator"], entry, data["controller"]),
     ]
     
     async_add_entities(entities)
 
 
-class OptimalRunningBinarySensor(BinarySensorEntity):
+class OptimalRunningBinarySensor(CoordinatorEntity[FuktstyrningCoordinator], BinarySensorEntity):
     """Binary sensor to indicate optimal times for running the dehumidifier."""
 
     _attr_has_entity_name = True
     _attr_device_class = BinarySensorDeviceClass.RUNNING
     _attr_icon = "mdi:clock-time-five-outline"
 
-    def __init__(self, hass, entry, controller):
+    def __init__(self, coordinator, entry, controller):
         """Initialize the binary sensor."""
-        self.hass = hass
+        super().__init__(coordinator)
         self.entry = entry
         self.controller = controller
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name="Fuktstyrning Dehumidifier Controller",
-            manufacturer="Fuktstyrning",
-            model="Smart Dehumidifier Control",
-        )
+        self._attr_device_info = coordinator.device_info
         self._attr_unique_id = f"{entry.entry_id}_{BINARY_SENSOR_OPTIMAL_RUNNING_UNIQUE_ID}"
         self._attr_name = BINARY_SENSOR_OPTIMAL_RUNNING_NAME
         self._attr_is_on = False
@@ -60,36 +56,46 @@ class OptimalRunningBinarySensor(BinarySensorEntity):
             "average_price_today": None,
             "is_below_average": False,
         }
+        # (is_on, current price, average price) behind the published state
+        self._last_sig: tuple | None = None
 
-    async def async_update(self) -> None:
-        """Update the binary sensor."""
-        # Get current hour
-        from datetime import datetime
-        current_hour = datetime.now().hour
-        
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.controller.index_entity(self.entity_id)
+        if self.coordinator.data is not None:
+            self._update_from_snapshot(self.coordinator.data)
+
+    async def async_will_remove_from_hass(self) -> None:
+        self.controller.unindex_entity(self.entity_id)
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._update_from_snapshot(self.coordinator.data):
+            self.async_write_ha_state()
+
+    def _update_from_snapshot(self, data: FuktstyrningSnapshot) -> bool:
+        """Update from the coordinator snapshot; return False if nothing changed."""
         # Check if this hour is in the optimal schedule
-        is_optimal = self.controller.schedule.get(current_hour, False)
+        is_optimal = bool((data.schedule_mask >> data.now.hour) & 1)
+        current_price = data.current_price
+        avg_price = data.average_price_today
+
+        sig = (is_optimal, current_price, avg_price)
+        if sig == self._last_sig:
+            return False
+        self._last_sig = sig
+
         self._attr_is_on = is_optimal
-        
-        # Get current price and average price
-        price_sensor = self.hass.states.get(self.controller.price_sensor)
-        if price_sensor and "today" in price_sensor.attributes:
-            current_price = None
-            if price_sensor.state not in ("unknown", "unavailable", None):
-                try:
-                    current_price = float(price_sensor.state)
-                except ValueError:
-                    current_price = None
-            if current_price is not None:
-                today_prices = price_sensor.attributes.get("today", [])
-                if today_prices:
-                    avg_price = sum(today_prices) / len(today_prices)
-                    self._attr_extra_state_attributes.update({
-                        "current_hour_price": current_price,
-                        "average_price_today": avg_price,
-                        "is_below_average": current_price < avg_price,
-                    })
-            else:
-                self._attr_extra_state_attributes.pop("current_hour_price", None)
-                self._attr_extra_state_attributes.pop("average_price_today", None)
-                self._attr_extra_state_attributes.pop("is_below_average", None)
+        if current_price is not None:
+            if avg_price is not None:
+                self._attr_extra_state_attributes.update({
+                    "current_hour_price": current_price,
+                    "average_price_today": avg_price,
+                    "is_below_average": current_price < avg_price,
+                })
+        else:
+            self._attr_extra_state_attributes.pop("current_hour_price", None)
+            self._attr_extra_state_attributes.pop("average_price_today", None)
+            self._attr_extra_state_attributes.pop("is_below_average", None)
+        return True
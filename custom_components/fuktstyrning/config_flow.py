@@ -9,6 +9,7 @@ from homeassistant.helpers import selector
 from .const import (
     DOMAIN,
     CONF_HUMIDITY_SENSOR,
+    CONF_TEMPERATURE_SENSOR,
     CONF_PRICE_SENSOR,
     CONF_DEHUMIDIFIER_SWITCH,
     CONF_WEATHER_ENTITY,
@@ -49,6 +50,13 @@ class FuktstyrningConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     if not hass.states.get(humidity_sensor):
                         errors[CONF_HUMIDITY_SENSOR] = "entity_not_found"
                     
+                temperature_sensor = user_input.get(CONF_TEMPERATURE_SENSOR)
+                if temperature_sensor:
+                    temperature_sensor = temperature_sensor.strip()
+                    _LOGGER.debug("Selected temperature sensor: %s", temperature_sensor)
+                    if not hass.states.get(temperature_sensor):
+                        errors[CONF_TEMPERATURE_SENSOR] = "entity_not_found"
+                    
                 price_sensor = user_input.get(CONF_PRICE_SENSOR)
                 if price_sensor:
                     price_sensor = price_sensor.strip()
@@ -127,6 +135,9 @@ class FuktstyrningConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Required(CONF_DEHUMIDIFIER_SWITCH): selector.EntitySelector(
                 selector.EntitySelectorConfig(domain="switch")
             ),
+            vol.Optional(CONF_TEMPERATURE_SENSOR): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="sensor")
+            ),
             vol.Optional(CONF_OUTDOOR_HUMIDITY_SENSOR): selector.EntitySelector(
                 selector.EntitySelectorConfig(domain="sensor")
             ),
@@ -203,6 +214,12 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     min=0.1, max=10.0, step=0.1, unit_of_measurement="SEK/kWh"
                 )
             ),
+            vol.Optional(
+                CONF_TEMPERATURE_SENSOR,
+                default=options.get(CONF_TEMPERATURE_SENSOR, data.get(CONF_TEMPERATURE_SENSOR, ""))
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="sensor")
+            ),
             vol.Optional(
                 CONF_OUTDOOR_HUMIDITY_SENSOR,
                 default=options.get(CONF_OUTDOOR_HUMIDITY_SENSOR, data.get(CONF_OUTDOOR_HUMIDITY_SENSOR, ""))
@@ -1,16 +1,26 @@
 """Constants for the Fuktstyrning integration."""
 
 DOMAIN = "fuktstyrning"
+# hass.data key for the entity_id -> controller index used by services
+DATA_ENTITY_INDEX = f"{DOMAIN}_entity_index"
+# hass.data key for the entry_id -> controller map of all loaded entries
+DATA_CONTROLLERS = f"{DOMAIN}_controllers"
+# Dispatcher signal sent when a controller builds a new schedule (format with entry_id)
+SIGNAL_SCHEDULE_UPDATED = f"{DOMAIN}_schedule_updated_{{}}"
+# Dispatcher signal sent when a controller's humidity override toggles (format with entry_id)
+SIGNAL_OVERRIDE_CHANGED = f"{DOMAIN}_override_changed_{{}}"
 PLATFORMS = ["sensor", "switch", "binary_sensor"]
 
 SERVICE_UPDATE_SCHEDULE = "update_schedule"
 SERVICE_RESET_COST_SAVINGS = "reset_cost_savings"
 SERVICE_SET_MAX_HUMIDITY = "set_max_humidity"
 SERVICE_LEARNING_RESET = "learning_reset"   # <-- NY tjänst
+SERVICE_GET_LEARNING_MODEL = "get_learning_model"
 ATTR_ENTITY_ID = "entity_id"
 
 # Configuration
 CONF_HUMIDITY_SENSOR = "humidity_sensor"
+CONF_TEMPERATURE_SENSOR = "temperature_sensor"
 CONF_PRICE_SENSOR = "price_sensor"
 CONF_DEHUMIDIFIER_SWITCH = "dehumidifier_switch"
 CONF_WEATHER_ENTITY = "weather_entity"
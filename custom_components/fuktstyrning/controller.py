@@ -15,17 +15,18 @@ import logging
 import math
 import asyncio
 from datetime import datetime, time, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import homeassistant.util.dt as dt_util
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.recorder import get_instance
 from homeassistant.helpers.storage import Store
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_track_state_change_event, async_call_later, async_track_time_interval
 from homeassistant.helpers.update_coordinator import UpdateFailed
-from homeassistant.const import STATE_UNKNOWN, STATE_UNAVAILABLE
 from homeassistant.exceptions import ConfigEntryNotReady
+from .coordinator import BAD_STATES, entry_value, price_items, read_float
 from .scheduler import build_optimized_schedule
 from .learning import DehumidifierLearningModule
 from .lambda_manager import LambdaManager
@@ -42,6 +43,10 @@ from .const import (
     CONF_MAX_HUMIDITY,
     DEFAULT_MAX_HUMIDITY,
     CONTROLLER_STORAGE_KEY,
+    DATA_ENTITY_INDEX,
+    DATA_CONTROLLERS,
+    SIGNAL_SCHEDULE_UPDATED,
+    SIGNAL_OVERRIDE_CHANGED,
     DEFAULT_TIME_TO_REDUCE,
     DEFAULT_TIME_TO_INCREASE,
 )
@@ -60,27 +65,49 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
         self.hass = hass
         self.entry = entry
 
-        # Config options
-        self.humidity_sensor: str | None = entry.data.get(CONF_HUMIDITY_SENSOR)
-        self.price_sensor: str | None = entry.data.get(CONF_PRICE_SENSOR)
-        self.dehumidifier_switch: str | None = entry.data.get(CONF_DEHUMIDIFIER_SWITCH)
-        self.weather_entity: str | None = entry.data.get(CONF_WEATHER_ENTITY)
-        self.outdoor_humidity_sensor: str | None = entry.data.get(CONF_OUTDOOR_HUMIDITY_SENSOR)
-        self.outdoor_temp_sensor: str | None = entry.data.get(CONF_OUTDOOR_TEMP_SENSOR)
-        self.power_sensor: str | None = entry.data.get(CONF_POWER_SENSOR)
-        self.energy_sensor: str | None = entry.data.get(CONF_ENERGY_SENSOR)
-        self.voltage_sensor: str | None = entry.data.get(CONF_VOLTAGE_SENSOR)
+        # Config options; the options flow overrides the setup data
+        self.humidity_sensor: str | None = entry_value(entry, CONF_HUMIDITY_SENSOR)
+        self.price_sensor: str | None = entry_value(entry, CONF_PRICE_SENSOR)
+        self.dehumidifier_switch: str | None = entry_value(entry, CONF_DEHUMIDIFIER_SWITCH)
+        self.weather_entity: str | None = entry_value(entry, CONF_WEATHER_ENTITY)
+        self.outdoor_humidity_sensor: str | None = entry_value(entry, CONF_OUTDOOR_HUMIDITY_SENSOR)
+        self.outdoor_temp_sensor: str | None = entry_value(entry, CONF_OUTDOOR_TEMP_SENSOR)
+        self.power_sensor: str | None = entry_value(
+            entry, CONF_POWER_SENSOR, "sensor.lumi_lumi_plug_maeu01_active_power"
+        )
+        self.energy_sensor: str | None = entry_value(entry, CONF_ENERGY_SENSOR)
+        self.voltage_sensor: str | None = entry_value(entry, CONF_VOLTAGE_SENSOR)
 
-        self.max_humidity: float = entry.data.get(CONF_MAX_HUMIDITY, DEFAULT_MAX_HUMIDITY)
+        self.max_humidity: float = entry_value(entry, CONF_MAX_HUMIDITY, DEFAULT_MAX_HUMIDITY)
 
         # Runtime state
         self.schedule: Dict[int, bool] = {}
+        # Same schedule as a 24-bit mask, bit h set when hour h should run
+        self.schedule_mask: int = 0
         self.schedule_created_date: Optional[datetime] = None
-        self.override_active: bool = False
+        self._override_active: bool = False
         self.cost_savings: float = 0.0
+        # Parsed price forecast, reused until the price sensor publishes a new state
+        self._price_forecast_state = None
+        self._price_forecast: list[float] | None = None
         self._store = Store(hass, 1, "fuktstyrning_controller_data")
+        # entity_id -> controller index shared by all entries, used by services
+        self._entity_index: Dict[str, "FuktstyrningController"] = hass.data.setdefault(
+            DATA_ENTITY_INDEX, {}
+        )
+        # entry_id -> controller map shared by all entries, used by services;
+        # the controller joins both in register() once setup has succeeded
+        self._controllers: Dict[str, "FuktstyrningController"] = hass.data.setdefault(
+            DATA_CONTROLLERS, {}
+        )
         # Entity ID for the smart control switch
-        self.smart_switch_entity_id: Optional[str] = None
+        self._smart_switch_entity_id: Optional[str] = None
+        # State listener unsubscribers, set in initialize()
+        self._price_unsub: Optional[Callable[[], None]] = None
+        self._humidity_unsub: Optional[Callable[[], None]] = None
+        # Timer unsubscribers; cancelled on shutdown so they stop holding the controller
+        self._lambda_adjust_unsub: Optional[Callable[[], None]] = None
+        self._monitor_rise_unsub: Optional[Callable[[], None]] = None
 
         # simple defaults for learning
         self.dehumidifier_data: Dict[str, Any] = {
@@ -99,6 +126,41 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
         self.humidity_at_time_off: float | None = None
         self.ground_state: str = "Neutral"
 
+    @property
+    def smart_switch_entity_id(self) -> Optional[str]:
+        """Entity ID of the smart control switch, once the switch is added."""
+        return self._smart_switch_entity_id
+
+    @smart_switch_entity_id.setter
+    def smart_switch_entity_id(self, entity_id: Optional[str]) -> None:
+        if self._smart_switch_entity_id:
+            self.unindex_entity(self._smart_switch_entity_id)
+        self._smart_switch_entity_id = entity_id
+        if entity_id:
+            self.index_entity(entity_id)
+
+    @property
+    def override_active(self) -> bool:
+        """True while humidity overrides the price schedule."""
+        return self._override_active
+
+    @override_active.setter
+    def override_active(self, active: bool) -> None:
+        if active == self._override_active:
+            return
+        self._override_active = active
+        # The smart switch publishes the flag; push instead of polling
+        async_dispatcher_send(self.hass, SIGNAL_OVERRIDE_CHANGED.format(self.entry.entry_id))
+
+    def index_entity(self, entity_id: str) -> None:
+        """Let services resolve ``entity_id`` to this controller."""
+        self._entity_index[entity_id] = self
+
+    def unindex_entity(self, entity_id: str) -> None:
+        """Remove ``entity_id`` from the service index if it points here."""
+        if self._entity_index.get(entity_id) is self:
+            del self._entity_index[entity_id]
+
     @property
     def smart_enabled(self) -> bool:
         """Return True if smart-control switch is enabled."""
@@ -140,7 +202,7 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
         await self.lambda_manager.async_init(self.hass, avg_price)
         
         # Setup weekly lambda adjustment
-        async_track_time_interval(
+        self._lambda_adjust_unsub = async_track_time_interval(
             self.hass,
             lambda _: asyncio.create_task(self.lambda_manager.weekly_adjust()),
             timedelta(days=7)
@@ -169,14 +231,34 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
         await self._create_daily_schedule()
         _LOGGER.debug("Fuktstyrning controller initialized")
 
+    def register(self) -> None:
+        """Make this controller resolvable by the domain-wide services."""
+        if self.dehumidifier_switch:
+            self.index_entity(self.dehumidifier_switch)
+        self._controllers[self.entry.entry_id] = self
+
+    def release(self) -> None:
+        """Unregister from services and cancel listeners and timers.
+
+        Also used to clean up after a failed setup, so it must not assume
+        that initialize() got all the way through.
+        """
+        # Drop this controller from the service entity index
+        for entity_id in [eid for eid, ctrl in self._entity_index.items() if ctrl is self]:
+            del self._entity_index[entity_id]
+        if self._controllers.get(self.entry.entry_id) is self:
+            del self._controllers[self.entry.entry_id]
+        # Unregister price-ready and humidity listeners, cancel the weekly
+        # lambda adjustment and any pending ground-state check
+        for attr in ("_price_unsub", "_humidity_unsub", "_lambda_adjust_unsub", "_monitor_rise_unsub"):
+            unsub = getattr(self, attr)
+            if unsub:
+                unsub()
+                setattr(self, attr, None)
+
     async def shutdown(self) -> None:
         self.scheduler.stop()
-        # Unregister price-ready listener
-        if getattr(self, '_price_unsub', None):
-            self._price_unsub()
-        # Unregister humidity listener
-        if getattr(self, '_humidity_unsub', None):
-            self._humidity_unsub()
+        self.release()
         # Save data
         await self._store.async_save({
             "dehumidifier_data": self.dehumidifier_data,
@@ -208,7 +290,7 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
         now = dt_util.now()
         # override if humidity > threshold
         humidity_state = self.hass.states.get(self.humidity_sensor)
-        if not humidity_state or humidity_state.state in ("unknown", "unavailable"):
+        if not humidity_state or humidity_state.state in BAD_STATES:
             _LOGGER.warning("Humidity sensor unavailable: %s", self.humidity_sensor)
             return
         try:
@@ -220,27 +302,12 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
         # --- record humidity data after reading current_humidity ---
         try:
             weather = self.hass.states.get(self.weather_entity).state if self.weather_entity else None
-            out_rh = self.hass.states.get(self.outdoor_humidity_sensor)
-            out_t = self.hass.states.get(self.outdoor_temp_sensor)
-
-            outdoor_humidity = None
-            if out_rh and out_rh.state not in ("unknown", "unavailable", None):
-                try:
-                    outdoor_humidity = float(out_rh.state)
-                except ValueError:
-                    outdoor_humidity = None
-
-            outdoor_temp = None
-            if out_t and out_t.state not in ("unknown", "unavailable", None):
-                try:
-                    outdoor_temp = float(out_t.state)
-                except ValueError:
-                    outdoor_temp = None
+            outdoor_humidity = read_float(self.hass, self.outdoor_humidity_sensor)
+            outdoor_temp = read_float(self.hass, self.outdoor_temp_sensor)
 
             # Temperatur från inomhus-sensorn (om attribut finns)
             temperature = None
-            humidity_state = self.hass.states.get(self.humidity_sensor)
-            if humidity_state and humidity_state.attributes.get("temperature") is not None:
+            if humidity_state.attributes.get("temperature") is not None:
                 temp_attr = humidity_state.attributes.get("temperature")
                 try:
                     temperature = float(temp_attr)
@@ -250,19 +317,9 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
                         temp_attr
                     )
 
-            # Effekt & energi
-            power  = None
-            energy = None
-            if self.power_sensor:
-                try:
-                    power = float(self.hass.states.get(self.power_sensor).state)
-                except (TypeError, ValueError):
-                    pass
-            if self.energy_sensor:
-                try:
-                    energy = float(self.hass.states.get(self.energy_sensor).state)
-                except (TypeError, ValueError):
-                    pass
+            # Effekt & energi (None när sensorn saknas eller är unknown/unavailable)
+            power = read_float(self.hass, self.power_sensor)
+            energy = read_float(self.hass, self.energy_sensor)
 
             # Avfuktaren anses *på* om:
             #  • schemat säger det, eller
@@ -270,7 +327,7 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
             #  • effekt­sensorn visar > 10 W (manuell start)
             is_on = (
                 self.override_active
-                or self.schedule.get(now.hour, False)
+                or bool((self.schedule_mask >> now.hour) & 1)
                 or (power is not None and power > 10)
             )
 
@@ -310,7 +367,7 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
         """Build a 24‑h schedule based on price forecast and humidity."""
         # Retry‑mekanism för fördröjd luftfuktighetssensor vid uppstart
         sensor_state = self.hass.states.get(self.humidity_sensor)
-        if sensor_state is None or sensor_state.state in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+        if sensor_state is None or sensor_state.state in BAD_STATES:
             raise ConfigEntryNotReady(f"Humidity sensor {self.humidity_sensor} not ready yet")
         # Hämta aktuell fuktighet och modellparametrar
         try:
@@ -320,16 +377,9 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
             return
 
         # Läs temperatur och väder
-        temp_state = self.hass.states.get(self.outdoor_temp_sensor)
-        if temp_state and temp_state.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
-            try:
-                temperature = float(temp_state.state)
-            except (ValueError, TypeError):
-                temperature = None
-        else:
-            temperature = None
+        temperature = read_float(self.hass, self.outdoor_temp_sensor)
         weather_state = self.hass.states.get(self.weather_entity)
-        weather = weather_state.state if weather_state and weather_state.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE) else None
+        weather = weather_state.state if weather_state and weather_state.state not in BAD_STATES else None
 
         try:
             price_forecast = self._get_price_forecast()
@@ -356,19 +406,21 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
         # Mappa schema till klockslag (24h)
         now_h = dt_util.now().hour
         self.schedule = { (now_h + i) % 24: run for i, run in enumerate(schedule_list[:24]) }
+        self.schedule_mask = sum(1 << hour for hour, run in self.schedule.items() if run)
         self.schedule_created_date = dt_util.now()
         _LOGGER.info(
             "Generated schedule with %d hours (created %s)",
-            sum(1 for r in self.schedule.values() if r),
+            self.schedule_mask.bit_count(),
             self.schedule_created_date,
         )
+        async_dispatcher_send(self.hass, SIGNAL_SCHEDULE_UPDATED.format(self.entry.entry_id))
 
     async def _follow_schedule(self) -> None:
         # Respect smart-control switch
         if not self.smart_enabled:
             return
         now_hour = dt_util.now().hour
-        should_run = self.schedule.get(now_hour, False)
+        should_run = (self.schedule_mask >> now_hour) & 1
         if should_run:
             await self._turn_on_dehumidifier()
         else:
@@ -387,7 +439,7 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
         if not forecast:
             return
         baseline_price = sum(forecast) / len(forecast)
-        hours_on = sum(1 for v in self.schedule.values() if v)
+        hours_on = self.schedule_mask.bit_count()
         always_on_hours = 8  # assume historical pattern
         hours_saved = max(0, always_on_hours - hours_on)
         self.cost_savings = round(baseline_price * hours_saved, 2)
@@ -399,16 +451,24 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
     async def _turn_on_dehumidifier(self) -> None:
         await self.hass.services.async_call("switch", "turn_on", {"entity_id": self.dehumidifier_switch}, blocking=True)
 
-    async def _turn_off_dehumidifier(self) -> None:
-        # Record off time and humidity
-        state = self.hass.states.get(self.humidity_sensor)
-        if state and state.state not in ("unknown", "unavailable"):
-            try:
-                self.humidity_at_time_off = float(state.state)
-            except (ValueError, TypeError):
-                pass
-        self.time_off = dt_util.now()
-        async_call_later(self.hass, 90 * 60, self._monitor_rise)
+    async def _turn_off_dehumidifier(self, humidity: Optional[float] = None) -> None:
+        switch = self.hass.states.get(self.dehumidifier_switch)
+        # The schedule calls this every tick during off hours; nothing to do
+        # once the switch is already off
+        if switch and switch.state == "off":
+            return
+        # Record off time and humidity only on a real on→off transition and
+        # never replace a pending check, otherwise it would be pushed back
+        # on every tick and never measure the off-period
+        if switch and switch.state == "on" and not self._monitor_rise_unsub:
+            # Callers that already parsed the current reading pass it in to
+            # skip a second state lookup
+            if humidity is None:
+                humidity = read_float(self.hass, self.humidity_sensor)
+            if humidity is not None:
+                self.humidity_at_time_off = humidity
+            self.time_off = dt_util.now()
+            self._monitor_rise_unsub = async_call_later(self.hass, 90 * 60, self._monitor_rise)
         # Turn off dehumidifier
         await self.hass.services.async_call(
             "switch", "turn_off", {"entity_id": self.dehumidifier_switch}, blocking=True
@@ -423,6 +483,9 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
         if not st:
             _LOGGER.warning("Price sensor %s not found", self.price_sensor)
             raise UpdateFailed("Missing price forecast")
+        # State objects are replaced on every change, so identity means unchanged
+        if st is self._price_forecast_state:
+            return self._price_forecast
         # Try raw_today/raw_tomorrow first
         raw_today = st.attributes.get("raw_today", [])
         raw_tomorrow = st.attributes.get("raw_tomorrow", []) if st.attributes.get("tomorrow_valid", False) else []
@@ -444,15 +507,7 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
             # Fallback to 'today'/'tomorrow' attributes
             prices_today = st.attributes.get("today", [])
             prices_tomorrow = st.attributes.get("tomorrow", []) if st.attributes.get("tomorrow_valid", False) else []
-            items = []
-            if isinstance(prices_today, str):
-                items += [p.strip() for p in prices_today.split(",")]
-            elif isinstance(prices_today, list):
-                items += prices_today
-            if isinstance(prices_tomorrow, str):
-                items += [p.strip() for p in prices_tomorrow.split(",")]
-            elif isinstance(prices_tomorrow, list):
-                items += prices_tomorrow
+            items = price_items(prices_today) + price_items(prices_tomorrow)
             for entry in items[:24]:
                 try:
                     val = str(entry).replace(",", ".")
@@ -462,6 +517,8 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
         if not forecast:
             _LOGGER.warning("No valid price forecast for sensor %s", self.price_sensor)
             raise UpdateFailed("Missing price forecast")
+        self._price_forecast_state = st
+        self._price_forecast = forecast
         return forecast
 
     async def _get_rain_forecast(self) -> int:
@@ -490,7 +547,7 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
         if not new_state:
             _LOGGER.debug("async_handle_humidity_change: new_state is None for %s, ignoring", entity_id)
             return
-        if new_state.state in ("unknown", "unavailable"):
+        if new_state.state in BAD_STATES:
             _LOGGER.debug(
                 "async_handle_humidity_change: Sensor %s state '%s' not available, skipping",
                 entity_id,
@@ -530,20 +587,17 @@ class FuktstyrningController:  # pylint: disable=too-many-instance-attributes
                 self.max_humidity - 5
             )
             await self.lambda_manager.record_event(overflow=False)
-            await self._turn_off_dehumidifier()
+            await self._turn_off_dehumidifier(new_humidity)
             self.override_active = False
             _LOGGER.warning("Override OFF: humidity back under control")
 
     async def _monitor_rise(self, now) -> None:
         """Monitor humidity rise after dehumidifier is turned off."""
+        self._monitor_rise_unsub = None
         if not self.time_off or self.humidity_at_time_off is None:
             return
-        state = self.hass.states.get(self.humidity_sensor)
-        if not state or state.state in ("unknown", "unavailable"):
-            return
-        try:
-            humidity_now = float(state.state)
-        except (ValueError, TypeError):
+        humidity_now = read_float(self.hass, self.humidity_sensor)
+        if humidity_now is None:
             return
         delta_min = (now - self.time_off).total_seconds() / 60
         rise_rate = (humidity_now - self.humidity_at_time_off) / delta_min
@@ -0,0 +1,226 @@
+"""Shared data coordinator for Fuktstyrning sensors.
+
+All sensors of a config entry read the same source entities and the same
+learning model. The coordinator gathers them once per interval into an
+immutable snapshot that every sensor derives its state from.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DOMAIN,
+    SIGNAL_SCHEDULE_UPDATED,
+    CONF_TEMPERATURE_SENSOR,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+UPDATE_INTERVAL = timedelta(seconds=30)
+
+# Source states that carry no numeric reading
+BAD_STATES = frozenset((STATE_UNKNOWN, STATE_UNAVAILABLE, None))
+
+
+def entry_value(entry: ConfigEntry, key: str, default: Any = None) -> Any:
+    """Return a setting of ``entry``, options flow first, then setup data.
+
+    The options flow stores cleared entity fields as "", which means unset.
+    """
+    value = entry.options.get(key, entry.data.get(key, default))
+    return None if value == "" else value
+
+
+def state_float(state: State | None) -> float | None:
+    """Return the numeric value of ``state``, or None if missing or not numeric."""
+    value = state.state if state else None
+    if value in BAD_STATES:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def read_float(hass: HomeAssistant, entity_id: str | None) -> float | None:
+    """Return the numeric state of ``entity_id``, or None if missing or not numeric."""
+    if not entity_id:
+        return None
+    return state_float(hass.states.get(entity_id))
+
+
+def price_items(value: Any) -> list:
+    """Return the items of a Nordpool ``today``/``tomorrow`` attribute.
+
+    Nordpool publishes them either as a list or as a comma-separated string.
+    """
+    if isinstance(value, str):
+        return [p.strip() for p in value.split(",")]
+    if isinstance(value, list):
+        return value
+    return []
+
+
+def _average_price(value: Any) -> float | None:
+    """Return the mean of the numeric items of a price attribute, if any."""
+    prices = []
+    for item in price_items(value):
+        try:
+            prices.append(float(str(item).replace(",", ".")))
+        except (TypeError, ValueError):
+            continue
+    return sum(prices) / len(prices) if prices else None
+
+
+@dataclass(frozen=True, slots=True)
+class FuktstyrningSnapshot:
+    """Everything the sensors need from one update cycle."""
+
+    now: datetime
+    humidity: Optional[float]
+    temperature: Optional[float]
+    power: Optional[float]
+    energy: Optional[float]
+    current_price: Optional[float]
+    optimal_price: Optional[float]
+    average_price_today: Optional[float]
+    dehumidifier_on: bool
+    schedule: Dict[int, bool]
+    schedule_mask: int
+    schedule_created: Optional[datetime]
+    schedule_created_iso: Optional[str]
+    cost_savings: float
+    ground_state: str
+    # None when the learning model could not be read this cycle
+    model: Optional[Dict[str, Any]]
+    model_version: int
+
+
+class FuktstyrningCoordinator(DataUpdateCoordinator[FuktstyrningSnapshot]):
+    """Collect controller state and source readings once per interval."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, controller) -> None:
+        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=UPDATE_INTERVAL)
+        self.controller = controller
+        self.entry_id = entry.entry_id
+        # One device for every entity of this entry, across platforms
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="Fuktstyrning Dehumidifier Controller",
+            manufacturer="Fuktstyrning",
+            model="Smart Dehumidifier Control",
+        )
+
+        # Aqara T1 rapporterar fukt och temperatur som två separata entiteter;
+        # utan temperatursensor blir daggpunkten okänd
+        self.temperature_entity = entry_value(entry, CONF_TEMPERATURE_SENSOR)
+        # Power and energy are the controller's, so both agree on the entities
+        self.power_entity = controller.power_sensor
+        self.energy_entity = controller.energy_sensor
+
+        # (schedule_created_date, its isoformat()) so the string is built once
+        self._created_cache: tuple = (None, None)
+        # (price state, average of its "today" prices); states are replaced on change
+        self._avg_cache: tuple = (None, None)
+
+    @callback
+    def async_track_sources(self) -> Callable[[], None]:
+        """Refresh as soon as a source entity changes; returns the unsubscribe.
+
+        The interval poll remains for controller-side changes (schedule,
+        savings, learning) that do not show up as state changes.
+        """
+        ctrl = self.controller
+        entity_ids = [
+            eid
+            for eid in (
+                ctrl.humidity_sensor,
+                ctrl.price_sensor,
+                ctrl.dehumidifier_switch,
+                self.temperature_entity,
+                self.power_entity,
+                self.energy_entity,
+            )
+            if eid
+        ]
+
+        @callback
+        def _async_source_changed(event: Event) -> None:
+            # Debounced, so bursts of source updates cause one refresh
+            self.hass.async_create_task(self.async_request_refresh())
+
+        return async_track_state_change_event(self.hass, entity_ids, _async_source_changed)
+
+    @callback
+    def async_track_schedule(self) -> Callable[[], None]:
+        """Refresh when the controller builds a new schedule; returns the unsubscribe."""
+
+        @callback
+        def _async_schedule_updated() -> None:
+            self.hass.async_create_task(self.async_request_refresh())
+
+        return async_dispatcher_connect(
+            self.hass, SIGNAL_SCHEDULE_UPDATED.format(self.entry_id), _async_schedule_updated
+        )
+
+    async def _async_update_data(self) -> FuktstyrningSnapshot:
+        hass = self.hass
+        ctrl = self.controller
+
+        try:
+            price_forecast: List[float] | None = ctrl._get_price_forecast()  # noqa: SLF001
+        except UpdateFailed as err:
+            _LOGGER.warning("Price forecast unavailable: %s", err)
+            price_forecast = None
+
+        price_state = hass.states.get(ctrl.price_sensor) if ctrl.price_sensor else None
+        if price_state is not self._avg_cache[0]:
+            today = price_state.attributes.get("today") if price_state else None
+            self._avg_cache = (price_state, _average_price(today))
+
+        switch = hass.states.get(ctrl.dehumidifier_switch) if ctrl.dehumidifier_switch else None
+
+        created = ctrl.schedule_created_date
+        if created is not self._created_cache[0]:
+            self._created_cache = (created, created.isoformat() if created else None)
+
+        learning = ctrl.learning_module
+        # A broken model should only blank the model fields, not fail the
+        # refresh and take every sensor of the entry with it
+        try:
+            model = learning.get_current_model()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Learning model unavailable: %s", err)
+            model = None
+
+        return FuktstyrningSnapshot(
+            now=dt_util.now(),
+            humidity=read_float(hass, ctrl.humidity_sensor),
+            temperature=read_float(hass, self.temperature_entity),
+            power=read_float(hass, self.power_entity),
+            energy=read_float(hass, self.energy_entity),
+            current_price=state_float(price_state),
+            optimal_price=min(price_forecast) if price_forecast else None,
+            average_price_today=self._avg_cache[1],
+            dehumidifier_on=bool(switch and switch.state == "on"),
+            schedule=ctrl.schedule,
+            schedule_mask=ctrl.schedule_mask,
+            schedule_created=created,
+            schedule_created_iso=self._created_cache[1],
+            cost_savings=ctrl.cost_savings,
+            ground_state=ctrl.ground_state,
+            model=model,
+            model_version=learning.model_version,
+        )
@@ -28,6 +28,22 @@ _LOGGER = logging.getLogger(__name__)
 SENSOR_LAMBDA_UNIQUE_ID = "lambda_parameter"
 SENSOR_LAMBDA_NAME = "Dehumidifier Lambda"
 
+
+def _prune_before(entries: List[Dict[str, Any]], cutoff: datetime) -> None:
+    """Drop entries older than ``cutoff`` in place.
+
+    Entries are appended in time order, so only the stale prefix (plus the
+    first fresh entry) needs its timestamp parsed.
+    """
+    stale = 0
+    for entry in entries:
+        if datetime.fromisoformat(entry["timestamp"]) >= cutoff:
+            break
+        stale += 1
+    if stale:
+        del entries[:stale]
+
+
 class LambdaManager:
     
     ENTITY_ID = "sensor.dehumidifier_lambda"
@@ -119,8 +135,7 @@ class LambdaManager:
             
             # Rensa gamla events (äldre än DAYS_IN_WEEK dagar)
             week_ago = now - timedelta(days=DAYS_IN_WEEK)
-            self._events = [e for e in self._events 
-                            if datetime.fromisoformat(e["timestamp"]) >= week_ago]
+            _prune_before(self._events, week_ago)
             
             # Spara data
             await self._save_data()
@@ -140,8 +155,7 @@ class LambdaManager:
             
             # Rensa gamla mätningar (äldre än DAYS_IN_WEEK dagar)
             week_ago = now - timedelta(days=DAYS_IN_WEEK)
-            self._max_humidity_window = [m for m in self._max_humidity_window 
-                                        if datetime.fromisoformat(m["timestamp"]) >= week_ago]
+            _prune_before(self._max_humidity_window, week_ago)
         
     async def weekly_adjust(self) -> None:
         """Adjust lambda value based on weekly data."""
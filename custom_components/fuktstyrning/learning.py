@@ -6,6 +6,7 @@ import json
 import os
 import asyncio
 import math
+from types import MappingProxyType
 
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_time_interval
@@ -30,6 +31,14 @@ except ImportError:
 
 _LOGGER = logging.getLogger(__name__)
 
+# Outdoor minus indoor absolute humidity difference categories
+_HUMIDITY_DIFF_CATEGORIES = MappingProxyType({
+    "negative": (-100, -5),  # Outdoor humidity is lower than indoor
+    "neutral": (-5, 5),     # Indoor and outdoor humidity are similar
+    "positive": (5, 15),     # Outdoor humidity is higher than indoor
+    "extreme": (15, 100)     # Outdoor humidity is much higher than indoor
+})
+
 class DehumidifierLearningModule:
     """Module for learning how humidity changes in the crawl space."""
     
@@ -59,6 +68,13 @@ class DehumidifierLearningModule:
         # Humidity data for learning
         self.humidity_data = []
         
+        # Bumped whenever the learned tables change, so consumers can cache
+        # anything they derive from them
+        self.model_version = 0
+        # Snapshot returned by get_current_model and the key it was built for
+        self._model_cache = None
+        self._model_cache_key = None
+        
         # Flag to make sure analysis is only done once
         self._analysis_scheduled = False
         
@@ -136,6 +152,7 @@ class DehumidifierLearningModule:
             if stored_data:
                 _LOGGER.debug("Loaded stored learning data (%d keys)", len(stored_data))
                 self.controller.dehumidifier_data.update(stored_data)
+                self.model_version += 1
             
             # Load humidity data history
             await self.hass.async_add_executor_job(self._load_humidity_data)
@@ -243,6 +260,7 @@ class DehumidifierLearningModule:
                     if "energy_efficiency" in stored_data:
                         self.controller.dehumidifier_data["energy_efficiency"] = stored_data["energy_efficiency"]
                     
+                    self.model_version += 1
                     _LOGGER.debug("Loaded learning data from store (%d keys)", len(stored_data))
                 except (ValueError, KeyError, TypeError) as schema_error:
                     # Handle future schema migration errors
@@ -322,9 +340,11 @@ class DehumidifierLearningModule:
         # Add to data set
         self.humidity_data.append(data_point)
         
-        # Keep the size reasonable (keep the most recent 1000 data points)
-        if len(self.humidity_data) > 1000:
-            self.humidity_data = self.humidity_data[-1000:]
+        # Keep the size reasonable (keep the most recent 1000 data points).
+        # Drop the overflow in place rather than copying 1000 points per reading.
+        overflow = len(self.humidity_data) - 1000
+        if overflow > 0:
+            del self.humidity_data[:overflow]
 
     # Helper to predict dehumidifier reduction rate including dynamic impacts
     def predict_reduction_rate(self, start_humidity: float, temperature: float = None, weather: str = None) -> float:
@@ -490,24 +510,28 @@ class DehumidifierLearningModule:
             },
         )
         
+        gaps = self._reading_gaps()
+
         # Analyze how humidity decreases when dehumidifier is on
-        self._analyze_humidity_reduction()
+        self._analyze_humidity_reduction(gaps)
         
         # Analyze how humidity increases when dehumidifier is off
-        self._analyze_humidity_increase()
+        self._analyze_humidity_increase(gaps)
         
         # Analyze how weather affects humidity increase rate
-        self._analyze_weather_impact()
+        self._analyze_weather_impact(gaps)
         
         # Analyze how temperature affects humidity behavior
-        self._analyze_temperature_impact()
+        self._analyze_temperature_impact(gaps)
         
         # Analyze how outdoor/indoor humidity difference affects increase rate
-        self._analyze_humidity_difference_impact()
+        self._analyze_humidity_difference_impact(gaps)
         
         # Analyze energy efficiency
         self._analyze_energy_efficiency()
         
+        self.model_version += 1
+        
         # Save updated model to store
         try:
             await self.save_learning_data()
@@ -518,7 +542,29 @@ class DehumidifierLearningModule:
             _LOGGER.exception("Unexpected error saving learning data after analysis: %s", exc)
             raise
 
-    def _analyze_humidity_reduction(self):
+    def _reading_gaps(self):
+        """Return seconds between each reading and the previous one.
+
+        Index 0 is always None, as is any pair whose timestamps cannot be parsed
+        or compared. Each timestamp is parsed once here instead of twice per
+        pair in every analyzer.
+        """
+        times = []
+        for point in self.humidity_data:
+            try:
+                times.append(datetime.fromisoformat(point["timestamp"]))
+            except (ValueError, TypeError, KeyError):
+                times.append(None)
+
+        gaps = [None]
+        for prev_time, curr_time in zip(times, times[1:]):
+            try:
+                gaps.append((curr_time - prev_time).total_seconds())
+            except TypeError:
+                gaps.append(None)
+        return gaps
+
+    def _analyze_humidity_reduction(self, gaps):
         """Analyze how fast humidity decreases when dehumidifier is on."""
         # Find consecutive records when dehumidifier was on and humidity decreased
         reduction_data = {}
@@ -529,10 +575,10 @@ class DehumidifierLearningModule:
             
             # Check if time between readings is reasonable (< 15 minutes)
             try:
-                prev_time = datetime.fromisoformat(prev["timestamp"])
-                curr_time = datetime.fromisoformat(curr["timestamp"])
-                
-                time_diff = (curr_time - prev_time).total_seconds() / 60  # in minutes
+                gap = gaps[i]
+                if gap is None:
+                    continue
+                time_diff = gap / 60  # in minutes
                 
                 if (prev["dehumidifier_on"] and curr["dehumidifier_on"] and 
                     prev["humidity"] > curr["humidity"] and 
@@ -574,7 +620,7 @@ class DehumidifierLearningModule:
                 
                 _LOGGER.info(f"Updated humidity reduction rate for {key}: {new_value:.1f} minutes")
 
-    def _analyze_humidity_increase(self):
+    def _analyze_humidity_increase(self, gaps):
         """Analyze how fast humidity increases when dehumidifier is off."""
         # Find consecutive records when dehumidifier was off and humidity increased
         increase_data = {}
@@ -585,10 +631,10 @@ class DehumidifierLearningModule:
             
             # Check if time between readings is reasonable (< 2 hours)
             try:
-                prev_time = datetime.fromisoformat(prev["timestamp"])
-                curr_time = datetime.fromisoformat(curr["timestamp"])
-                
-                time_diff = (curr_time - prev_time).total_seconds() / 3600  # in hours
+                gap = gaps[i]
+                if gap is None:
+                    continue
+                time_diff = gap / 3600  # in hours
                 
                 if (not prev["dehumidifier_on"] and not curr["dehumidifier_on"] and 
                     prev["humidity"] < curr["humidity"] and 
@@ -640,7 +686,7 @@ class DehumidifierLearningModule:
                 
                 _LOGGER.info(f"Updated humidity increase rate for {key}: {new_value:.1f} hours")
 
-    def _analyze_weather_impact(self):
+    def _analyze_weather_impact(self, gaps):
         """Analyze how weather affects humidity increase rate."""
         if not any("weather" in data and data["weather"] for data in self.humidity_data):
             return  # No weather data available
@@ -679,10 +725,10 @@ class DehumidifierLearningModule:
                 weather_category = "other"
                 
             try:
-                prev_time = datetime.fromisoformat(prev["timestamp"])
-                curr_time = datetime.fromisoformat(curr["timestamp"])
-                
-                time_diff = (curr_time - prev_time).total_seconds() / 3600  # in hours
+                gap = gaps[i]
+                if gap is None:
+                    continue
+                time_diff = gap / 3600  # in hours
                 
                 if (not prev["dehumidifier_on"] and not curr["dehumidifier_on"] and 
                     prev["humidity"] < curr["humidity"] and 
@@ -719,7 +765,7 @@ class DehumidifierLearningModule:
                     self.controller.dehumidifier_data["weather_impact"][category] = round(new_value, 2)
                     _LOGGER.info(f"Updated weather impact for {category}: {new_value:.2f}x")
 
-    def _analyze_temperature_impact(self):
+    def _analyze_temperature_impact(self, gaps):
         """Analyze how temperature affects humidity behavior."""
         if not any("temperature" in data and data["temperature"] for data in self.humidity_data):
             return  # No temperature data available
@@ -761,10 +807,10 @@ class DehumidifierLearningModule:
                 continue
                 
             try:
-                prev_time = datetime.fromisoformat(prev["timestamp"])
-                curr_time = datetime.fromisoformat(curr["timestamp"])
-                
-                time_diff = (curr_time - prev_time).total_seconds() / 3600  # in hours
+                gap = gaps[i]
+                if gap is None:
+                    continue
+                time_diff = gap / 3600  # in hours
                 
                 if time_diff > 0 and abs(prev["humidity"] - curr["humidity"]) > 0:
                     # Calculate the rate of humidity change (absolute)
@@ -798,7 +844,7 @@ class DehumidifierLearningModule:
                     self.controller.dehumidifier_data["temp_impact"][category] = round(new_value, 2)
                     _LOGGER.info(f"Updated temperature impact for {category}: {new_value:.2f}x")
 
-    def _analyze_humidity_difference_impact(self):
+    def _analyze_humidity_difference_impact(self, gaps):
         """Analyze how the outdoor/indoor humidity difference affects humidity increase rate."""
         # Check if we have enough data points with humidity difference
         if not any("humidity_diff" in data and data["humidity_diff"] is not None 
@@ -814,14 +860,6 @@ class DehumidifierLearningModule:
                 "extreme": 1.8     # When outdoor humidity is much higher than indoor
             }
             
-        # Categories for humidity differences
-        humidity_diff_categories = {
-            "negative": (-100, -5),  # Outdoor humidity is lower than indoor
-            "neutral": (-5, 5),     # Indoor and outdoor humidity are similar
-            "positive": (5, 15),     # Outdoor humidity is higher than indoor
-            "extreme": (15, 100)     # Outdoor humidity is much higher than indoor
-        }
-            
         # Group data by humidity difference category
         humidity_diff_data = {
             "negative": [],
@@ -846,7 +884,7 @@ class DehumidifierLearningModule:
                 
                 # Find the category this falls into
                 diff_category = None
-                for category, (min_diff, max_diff) in humidity_diff_categories.items():
+                for category, (min_diff, max_diff) in _HUMIDITY_DIFF_CATEGORIES.items():
                     if min_diff <= avg_humidity_diff < max_diff:
                         diff_category = category
                         break
@@ -854,10 +892,10 @@ class DehumidifierLearningModule:
                 if not diff_category:
                     continue
                     
-                prev_time = datetime.fromisoformat(prev["timestamp"])
-                curr_time = datetime.fromisoformat(curr["timestamp"])
-                
-                time_diff = (curr_time - prev_time).total_seconds() / 3600  # in hours
+                gap = gaps[i]
+                if gap is None:
+                    continue
+                time_diff = gap / 3600  # in hours
                 
                 # Only analyze periods when dehumidifier is off and humidity is increasing
                 if (not prev["dehumidifier_on"] and not curr["dehumidifier_on"] and 
@@ -1024,17 +1062,25 @@ class DehumidifierLearningModule:
         return round(change_per_hour * hours_diff, 2)
         
     def get_current_model(self):
-        """Return the current learning model data for display."""
-        return {
-            "time_to_reduce": self.controller.dehumidifier_data["time_to_reduce"],
-            "time_to_increase": self.controller.dehumidifier_data["time_to_increase"],
-            "weather_impact": self.controller.dehumidifier_data.get("weather_impact", {}),
-            "temp_impact": self.controller.dehumidifier_data.get("temp_impact", {}),
-            "humidity_diff_impact": self.controller.dehumidifier_data.get("humidity_diff_impact", {}),
-            "energy_efficiency": self.controller.dehumidifier_data.get("energy_efficiency", {}),
-            "data_points": len(self.humidity_data)
-        }
-        
+        """Return the current learning model data for display.
+
+        The same dict is returned until the learned tables change or the number
+        of data points moves, so callers share it and must not mutate it.
+        """
+        key = (self.model_version, len(self.humidity_data))
+        if key != self._model_cache_key:
+            self._model_cache = {
+                "time_to_reduce": self.controller.dehumidifier_data["time_to_reduce"],
+                "time_to_increase": self.controller.dehumidifier_data["time_to_increase"],
+                "weather_impact": self.controller.dehumidifier_data.get("weather_impact", {}),
+                "temp_impact": self.controller.dehumidifier_data.get("temp_impact", {}),
+                "humidity_diff_impact": self.controller.dehumidifier_data.get("humidity_diff_impact", {}),
+                "energy_efficiency": self.controller.dehumidifier_data.get("energy_efficiency", {}),
+                "data_points": len(self.humidity_data)
+            }
+            self._model_cache_key = key
+        return self._model_cache
+
     async def async_reset(self) -> None:
         """Reset learning tables and clear history."""
         # Återställ lokala tabeller
@@ -1055,6 +1101,7 @@ class DehumidifierLearningModule:
         # Initiera med standardvärden från const.py
         self.time_to_reduce.update(DEFAULT_TIME_TO_REDUCE)
         self.time_to_increase.update(DEFAULT_TIME_TO_INCREASE)
+        self.model_version += 1
         
         # Spara den återställda datan
         await self.save_learning_data()
@@ -0,0 +1,49 @@
+"""Psychrometric helpers (dew point) for Fuktstyrning integration."""
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Magnus-Tetens coefficients
+MAGNUS_A = 17.27
+MAGNUS_B = 237.7  # °C
+
+
+def dew_point(temperature: float, humidity: float) -> float:
+    """Return the dew point (°C) for a temperature (°C) and relative humidity (%)."""
+    gamma = MAGNUS_A * temperature / (MAGNUS_B + temperature) + math.log(humidity * 0.01)
+    return MAGNUS_B * gamma / (MAGNUS_A - gamma)
+
+
+def _dew_point_array(temperature: np.ndarray, humidity: np.ndarray) -> np.ndarray:
+    """Element-wise Magnus-Tetens dew point over two float64 arrays."""
+    gamma = MAGNUS_A * temperature / (MAGNUS_B + temperature) + np.log(humidity * 0.01)
+    return MAGNUS_B * gamma / (MAGNUS_A - gamma)
+
+
+if HAS_NUMBA:
+    # cache=True stores the compiled kernel on disk, so only the first call
+    # after installation pays the JIT compilation time
+    _dew_point_array = njit(cache=True, fastmath=True)(_dew_point_array)
+
+
+def dew_point_batch(
+    temperature: Sequence[float] | np.ndarray,
+    humidity: Sequence[float] | np.ndarray,
+) -> np.ndarray:
+    """Return dew points (°C) for equally long temperature/humidity series.
+
+    Meant for forecast horizons and historical analysis; single readings
+    should use ``dew_point``. Uses Numba when installed, NumPy otherwise.
+    """
+    temps = np.ascontiguousarray(temperature, dtype=np.float64)
+    hums = np.ascontiguousarray(humidity, dtype=np.float64)
+    return _dew_point_array(temps, hums).astype(np.float32)
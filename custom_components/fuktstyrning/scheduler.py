@@ -64,8 +64,13 @@ def build_optimized_schedule(
     peak_hours: Sequence[int] | None = None,
     base_buffer: float = SCHEDULER_DEFAULT_BASE_BUFFER,
     alpha: float,
+    rng=random,
 ) -> List[bool]:
-    """Returnerar ett bool-schema som lista av 24 boolska värden."""
+    """Returnerar ett bool-schema som lista av 24 boolska värden.
+
+    ``rng`` levererar ``choice`` för jittret; skicka t.ex. ``random.Random(seed)``
+    för reproducerbara scheman.
+    """
     assert isinstance(reduction_rate, (int, float)), "reduction_rate must be numeric"
     assert isinstance(increase_rate, (int, float)), "increase_rate must be numeric"
     
@@ -133,7 +138,7 @@ def build_optimized_schedule(
     # ---------------------------------------------------------
     # 5. Stokastisk jitter ±1 h
     # ---------------------------------------------------------
-    jittered = {max(0, min(SCHEDULER_MAX_HOURS_NEEDED - 1, h + random.choice([-1, 0, 1]))) for h in chosen}
+    jittered = {max(0, min(SCHEDULER_MAX_HOURS_NEEDED - 1, h + rng.choice([-1, 0, 1]))) for h in chosen}
     
     # Säkerställ bounds SCHEDULER_MIN_HOURS_NEEDED–SCHEDULER_MAX_HOURS_NEEDED
     while len(jittered) < SCHEDULER_MIN_HOURS_NEEDED:
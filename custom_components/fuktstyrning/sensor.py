@@ -8,10 +8,11 @@ from __future__ import annotations
 
 import logging
 import math
-from datetime import datetime, timedelta, time
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
-from homeassistant.helpers.update_coordinator import UpdateFailed
+import numpy as np
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -19,11 +20,11 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from .const import CONF_HUMIDITY_SENSOR, CONF_POWER_SENSOR, CONF_ENERGY_SENSOR
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
@@ -50,10 +51,132 @@ from .const import (
     ATTR_ENERGY_USED,
     ATTR_ENERGY_EFFICIENCY,
 )
+from .coordinator import FuktstyrningCoordinator, FuktstyrningSnapshot
+from .psychrometrics import dew_point
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _parse_buckets(table: Dict[str, float], scale: float) -> List[Tuple[float, float, float]]:
+    """Parse ``"a_to_b"`` model keys into ``(a, b, rate)`` tuples.
+
+    ``rate`` is the humidity change per prediction step (``scale`` converts the
+    learned duration unit into that step). Malformed keys are dropped once here
+    instead of on every update; table order is kept since buckets may overlap.
+    """
+    buckets: List[Tuple[float, float, float]] = []
+    for key, duration in table.items():
+        try:
+            start, end = map(float, key.split("_to_"))
+        except ValueError:
+            continue
+        rate = abs(start - end) * scale / duration if duration > 0 else 0.0
+        buckets.append((start, end, rate))
+    return buckets
+
+
+def _bucket_lut(
+    buckets: List[Tuple[float, float, float]], falling: bool
+) -> Tuple[int, List[int]] | None:
+    """Index the first matching bucket for every whole humidity percent.
+
+    With integer bucket edges the falling match ``a >= h > b`` depends only on
+    ceil(h) and the rising match ``a <= h < b`` only on floor(h), so one table
+    lookup replaces the scan. Returns ``(base, table)`` where ``table[k - base]``
+    is the bucket index for key ``k`` or -1, or None if any edge is fractional.
+    """
+    if not buckets:
+        return None
+    edges = np.array([(a, b) for a, b, _ in buckets], dtype=float)
+    if not np.array_equal(edges, np.floor(edges)):
+        return None
+    base = int(edges.min())
+    keys = np.arange(base, int(edges.max()) + 1)
+    table = np.full(keys.shape, -1, dtype=np.int32)
+    # Reverse order so the first bucket in table order wins, as in the scan
+    for index in range(len(buckets) - 1, -1, -1):
+        a, b = edges[index]
+        match = (keys <= a) & (keys > b) if falling else (keys >= a) & (keys < b)
+        table[match] = index
+    # Plain list: scalar indexing is cheaper than on an ndarray
+    return base, table.tolist()
+
+
+def _find_bucket(
+    buckets: List[Tuple[float, float, float]],
+    lut: Tuple[int, List[int]] | None,
+    humidity: float,
+    falling: bool,
+) -> Tuple[float, float, float] | None:
+    """Return the first bucket containing ``humidity``, or None."""
+    if lut is None:
+        for bucket in buckets:
+            a, b, _ = bucket
+            if (a >= humidity > b) if falling else (a <= humidity < b):
+                return bucket
+        return None
+    base, table = lut
+    index = (math.ceil(humidity) if falling else math.floor(humidity)) - base
+    if 0 <= index < len(table) and table[index] >= 0:
+        return buckets[table[index]]
+    return None
+
+
+def _predict_batch(
+    buckets: List[Tuple[float, float, float]],
+    lut: Tuple[int, List[int]] | None,
+    humidity: np.ndarray,
+    falling: bool,
+) -> np.ndarray:
+    """Vectorised ``_find_bucket`` plus one prediction step for every reading."""
+    if not buckets:
+        return humidity.copy()
+    if lut is None:
+        # Fractional bucket edges: no table, fall back to the scalar scan
+        index = np.array(
+            [
+                next(
+                    (
+                        i
+                        for i, (a, b, _) in enumerate(buckets)
+                        if ((a >= h > b) if falling else (a <= h < b))
+                    ),
+                    -1,
+                )
+                for h in humidity.tolist()
+            ],
+            dtype=np.int64,
+        )
+    else:
+        base, table = lut
+        keys = (np.ceil(humidity) if falling else np.floor(humidity)).astype(np.int64) - base
+        valid = (keys >= 0) & (keys < len(table))
+        index = np.where(valid, np.asarray(table)[np.clip(keys, 0, len(table) - 1)], -1)
+    ends = np.array([b for _, b, _ in buckets])[index]
+    rates = np.array([r for _, _, r in buckets])[index]
+    if falling:
+        stepped = np.maximum(ends, humidity - rates)
+    else:
+        stepped = np.minimum(ends, humidity + rates)
+    return np.where(index >= 0, stepped, humidity)
+
+
+@lru_cache(maxsize=64)
+def _next_run_offset(mask: int, hour: int, dehumidifier_on: bool) -> int:
+    """Return hours from ``hour`` to the next scheduled run in ``mask``, or -1.
+
+    0 means running now. Only the current mask is queried, so 64 entries
+    cover every (hour, on) pair of a schedule.
+    """
+    if dehumidifier_on and (mask >> hour) & 1:
+        return 0
+    # Rotate so bit 0 is the hour after ``hour``; the lowest set bit is then the next run
+    rot = ((mask >> (hour + 1)) | (mask << (23 - hour))) & 0xFFFFFF
+    if not rot:
+        return -1
+    return (rot & -rot).bit_length()
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -61,41 +184,106 @@ async def async_setup_entry(
 ) -> None:
     """Set up Fuktstyrning sensors from a config entry."""
 
-    controller = hass.data[DOMAIN][entry.entry_id]["controller"]
+    data = hass.data[DOMAIN][entry.entry_id]
+    controller = data["controller"]
+    coordinator: FuktstyrningCoordinator = data["coordinator"]
+
+    # One device for all entities of this entry
+    device_info = coordinator.device_info
+
+    prefix = entry.entry_id + "_"
 
     entities = [
-        CostSavingsSensor(hass, entry, controller),
-        HumidityPredictionSensor(hass, entry, controller),
-        LearningModelSensor(hass, entry, controller),
-        DewPointSensor(hass, entry, controller),
-        PowerSensor(hass, entry, controller),
-        GroundStateSensor(hass, entry, controller),
+        CostSavingsSensor(coordinator, entry, controller, device_info, prefix),
+        HumidityPredictionSensor(coordinator, entry, controller, device_info, prefix),
+        LearningModelSensor(coordinator, entry, controller, device_info, prefix),
+        DewPointSensor(coordinator, entry, controller, device_info, prefix),
+        PowerSensor(coordinator, entry, controller, device_info, prefix),
+        GroundStateSensor(coordinator, entry, controller, device_info, prefix),
     ]
     async_add_entities(entities)
 
 
+# -----------------------------------------------------------------------------
+# Shared base
+# -----------------------------------------------------------------------------
+
+
+class FuktstyrningSensor(CoordinatorEntity[FuktstyrningCoordinator], SensorEntity):
+    """Sensor whose state is derived from the shared coordinator snapshot."""
+
+    _attr_has_entity_name = True
+    # Set per subclass; appended to the entry prefix to form the unique id
+    _unique_id_suffix: str
+
+    def __init__(
+        self,
+        coordinator: FuktstyrningCoordinator,
+        entry: ConfigEntry,
+        controller,
+        device_info: DeviceInfo,
+        unique_id_prefix: str,
+    ):
+        super().__init__(coordinator)
+        # Shared attributes first, in the same order for every sensor, so all
+        # instances get the same attribute layout; subclasses add their own after
+        self.entry = entry
+        self.controller = controller
+        self._attr_device_info = device_info
+        self._attr_unique_id = unique_id_prefix + self._unique_id_suffix
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # Services target the cost savings sensor among others
+        self.controller.index_entity(self.entity_id)
+        # Initial state is written by HA right after this hook
+        if self.coordinator.data is not None:
+            self._update_from_snapshot(self.coordinator.data)
+
+    async def async_will_remove_from_hass(self) -> None:
+        self.controller.unindex_entity(self.entity_id)
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Only write when the published state actually changed
+        if self._update_from_snapshot(self.coordinator.data):
+            self.async_write_ha_state()
+
+    def _update_from_snapshot(self, data: FuktstyrningSnapshot) -> bool:
+        """Apply ``data`` to the entity; return False if nothing changed.
+
+        Subclasses override this; the base sensor has no state of its own.
+        """
+        return False
+
+
 # -----------------------------------------------------------------------------
 # Cost savings (monetary)
 # -----------------------------------------------------------------------------
 
 
-class CostSavingsSensor(SensorEntity):
+class CostSavingsSensor(FuktstyrningSensor):
     """Sensor that displays accumulated SEK saved by optimised runtime."""
 
-    _attr_has_entity_name = True
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_device_class = SensorDeviceClass.MONETARY
     _attr_state_class = SensorStateClass.TOTAL  # compliant with HA monetary rules
     _attr_native_unit_of_measurement = "SEK"
     _attr_icon = "mdi:cash-plus"
+    _attr_name = SENSOR_SAVINGS_NAME
+    _unique_id_suffix = SENSOR_SAVINGS_UNIQUE_ID
+
+    def __init__(
+        self,
+        coordinator: FuktstyrningCoordinator,
+        entry: ConfigEntry,
+        controller,
+        device_info: DeviceInfo,
+        unique_id_prefix: str,
+    ):
+        super().__init__(coordinator, entry, controller, device_info, unique_id_prefix)
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, controller):
-        self.hass = hass
-        self.entry = entry
-        self.controller = controller
-
-        self._attr_unique_id = f"{entry.entry_id}_{SENSOR_SAVINGS_UNIQUE_ID}"
-        self._attr_name = SENSOR_SAVINGS_NAME
         self._attr_native_value: float | None = 0.0
 
         self._attr_extra_state_attributes: Dict[str, Any] = {
@@ -104,42 +292,33 @@ class CostSavingsSensor(SensorEntity):
             ATTR_OPTIMAL_PRICE: None,
             ATTR_SCHEDULE: None,
         }
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name="Fuktstyrning Dehumidifier Controller",
-            manufacturer="Fuktstyrning",
-            model="Smart Dehumidifier Control",
+        # Inputs behind the last published state, to skip unchanged updates
+        self._last_sig: tuple | None = None
+
+    def _update_from_snapshot(self, data: FuktstyrningSnapshot) -> bool:
+        # Compared by value: an unchanged schedule costs one identity check,
+        # a rebuilt but identical one still counts as unchanged
+        sig = (
+            data.cost_savings,
+            data.current_price,
+            data.optimal_price,
+            data.schedule_created,
+            data.schedule,
         )
+        if sig == self._last_sig:
+            return False
+        self._last_sig = sig
 
-    async def async_update(self) -> None:  # type: ignore[override]
-        self._attr_native_value = self.controller.cost_savings
-
-        try:
-            price_forecast: List[float] | None = self.controller._get_price_forecast()  # noqa: SLF001
-        except UpdateFailed as err:
-            _LOGGER.warning("Price forecast unavailable: %s", err)
-            price_forecast = None
-
-        optimal_price: float | None = min(price_forecast) if price_forecast else None
-
-        price_state = self.hass.states.get(self.controller.price_sensor)
-        current_price: Optional[float] = None
-        if price_state and price_state.state not in ("unknown", "unavailable"):
-            try:
-                current_price = float(price_state.state)
-            except ValueError:
-                pass
-
+        self._attr_native_value = data.cost_savings
         self._attr_extra_state_attributes.update(
             {
-                ATTR_SCHEDULE_CREATED: self.controller.schedule_created_date.isoformat()
-                if self.controller.schedule_created_date
-                else None,
-                ATTR_CURRENT_PRICE: current_price,
-                ATTR_OPTIMAL_PRICE: optimal_price,
-                ATTR_SCHEDULE: self.controller.schedule,
+                ATTR_SCHEDULE_CREATED: data.schedule_created_iso,
+                ATTR_CURRENT_PRICE: data.current_price,
+                ATTR_OPTIMAL_PRICE: data.optimal_price,
+                ATTR_SCHEDULE: data.schedule,
             }
         )
+        return True
 
 
 # -----------------------------------------------------------------------------
@@ -147,93 +326,121 @@ class CostSavingsSensor(SensorEntity):
 # -----------------------------------------------------------------------------
 
 
-class HumidityPredictionSensor(SensorEntity):
+class HumidityPredictionSensor(FuktstyrningSensor):
     """Predict relative humidity one hour ahead."""
 
-    _attr_has_entity_name = True
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_device_class = SensorDeviceClass.HUMIDITY
     _attr_native_unit_of_measurement = "%"
     _attr_icon = "mdi:water-percent-alert"
+    _attr_name = SENSOR_HUMIDITY_PREDICTION_NAME
+    _unique_id_suffix = SENSOR_HUMIDITY_PREDICTION_UNIQUE_ID
+
+    def __init__(
+        self,
+        coordinator: FuktstyrningCoordinator,
+        entry: ConfigEntry,
+        controller,
+        device_info: DeviceInfo,
+        unique_id_prefix: str,
+    ):
+        super().__init__(coordinator, entry, controller, device_info, unique_id_prefix)
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, controller):
-        self.hass = hass
-        self.entry = entry
-        self.controller = controller
-
-        self._attr_unique_id = f"{entry.entry_id}_{SENSOR_HUMIDITY_PREDICTION_UNIQUE_ID}"
-        self._attr_name = SENSOR_HUMIDITY_PREDICTION_NAME
         self._attr_native_value: float | None = None
         self._attr_extra_state_attributes: Dict[str, Any] = {ATTR_NEXT_RUN: None}
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name="Fuktstyrning Dehumidifier Controller",
-            manufacturer="Fuktstyrning",
-            model="Smart Dehumidifier Control",
-        )
-
-    async def async_update(self) -> None:  # type: ignore[override]
-        humidity_state = self.hass.states.get(self.controller.humidity_sensor)
-        if not humidity_state or humidity_state.state in ("unknown", "unavailable"):
-            return
-        try:
-            current_humidity = float(humidity_state.state)
-        except ValueError:
-            return
-
-        model = self.controller.learning_module.get_current_model()
-        ttr = model.get("time_to_reduce", {})
-        tti = model.get("time_to_increase", {})
 
+        # Parsed learning tables, rebuilt only when the model version changes
+        self._model_version: int | None = None
+        self._ttr_buckets: List[Tuple[float, float, float]] = []
+        self._tti_buckets: List[Tuple[float, float, float]] = []
+        self._ttr_lut: Tuple[int, List[int]] | None = None
+        self._tti_lut: Tuple[int, List[int]] | None = None
+        # Inputs of the published prediction, humidity in 0.1 % bins
+        self._last_pred_key: tuple | None = None
+
+    def _update_from_snapshot(self, data: FuktstyrningSnapshot) -> bool:
+        current_humidity = data.humidity
+        if current_humidity is None:
+            return False
+
+        # Hour and mask are included since they decide the next-run attribute
+        key = (
+            round(current_humidity * 10),
+            data.model_version,
+            data.dehumidifier_on,
+            data.schedule_mask,
+            data.now.hour,
+        )
+        if key == self._last_pred_key:
+            return False
+        self._last_pred_key = key
+
+        # Without a model this cycle, keep predicting from the last tables
+        if data.model is not None and data.model_version != self._model_version:
+            model = data.model
+            # time_to_reduce: minutes per bucket -> % per hour
+            self._ttr_buckets = _parse_buckets(model.get("time_to_reduce", {}), 60.0)
+            # time_to_increase: hours per bucket -> % per hour
+            self._tti_buckets = _parse_buckets(model.get("time_to_increase", {}), 1.0)
+            self._ttr_lut = _bucket_lut(self._ttr_buckets, falling=True)
+            self._tti_lut = _bucket_lut(self._tti_buckets, falling=False)
+            self._model_version = data.model_version
+
+        dehumidifier_on = data.dehumidifier_on
         predicted = current_humidity
-        if self._is_dehumidifier_on():
+        if dehumidifier_on:
             # dehumidifier is ON → humidity will drop
-            for bucket, mins in ttr.items():
-                try:
-                    hi, lo = map(float, bucket.split("_to_"))
-                except ValueError:
-                    continue
-                if hi >= current_humidity > lo:
-                    rate_per_min = (hi - lo) / mins if mins > 0 else 0
-                    predicted = max(lo, current_humidity - rate_per_min * 60)
-                    break
+            bucket = _find_bucket(self._ttr_buckets, self._ttr_lut, current_humidity, True)
+            if bucket is not None:
+                predicted = max(bucket[1], current_humidity - bucket[2])
         else:
             # device off → humidity rise
-            for bucket, hrs in tti.items():
-                try:
-                    lo, hi = map(float, bucket.split("_to_"))
-                except ValueError:
-                    continue
-                if lo <= current_humidity < hi:
-                    rate_per_hr = (hi - lo) / hrs if hrs > 0 else 0
-                    predicted = min(hi, current_humidity + rate_per_hr)
-                    break
+            bucket = _find_bucket(self._tti_buckets, self._tti_lut, current_humidity, False)
+            if bucket is not None:
+                predicted = min(bucket[1], current_humidity + bucket[2])
 
         self._attr_native_value = round(predicted, 1)
+        next_run = self._find_next_run_time(data.now, data.schedule_mask, dehumidifier_on)
         self._attr_extra_state_attributes[ATTR_NEXT_RUN] = (
-            self._find_next_run_time().isoformat() if self._find_next_run_time() else None
+            next_run.isoformat() if next_run else None
+        )
+        return True
+
+    @staticmethod
+    def predict_batch(
+        model: Dict[str, Any], humidities: np.ndarray, on_mask: np.ndarray
+    ) -> np.ndarray:
+        """Predict the humidity one hour ahead for many readings at once.
+
+        Applies the same bucket tables as the live sensor, for backtests and
+        simulations over recorded history. ``on_mask`` holds the dehumidifier
+        state per reading. Values are returned unrounded; the sensor publishes
+        them to one decimal.
+        """
+        humidities = np.asarray(humidities, dtype=float)
+        on_mask = np.asarray(on_mask, dtype=bool)
+        ttr_buckets = _parse_buckets(model.get("time_to_reduce", {}), 60.0)
+        tti_buckets = _parse_buckets(model.get("time_to_increase", {}), 1.0)
+        falling = _predict_batch(
+            ttr_buckets, _bucket_lut(ttr_buckets, falling=True), humidities, True
+        )
+        rising = _predict_batch(
+            tti_buckets, _bucket_lut(tti_buckets, falling=False), humidities, False
         )
+        return np.where(on_mask, falling, rising)
 
     # ------------------------------------------------------------------
     # internal helpers
     # ------------------------------------------------------------------
 
-    def _is_dehumidifier_on(self) -> bool:
-        state = self.hass.states.get(self.controller.dehumidifier_switch)
-        return state.state == "on" if state else False
-
-    def _find_next_run_time(self) -> Optional[datetime]:
-        now = datetime.now()
-        current_hour = now.hour
-
-        if self._is_dehumidifier_on() and self.controller.schedule.get(current_hour, False):
+    @staticmethod
+    def _find_next_run_time(now: datetime, mask: int, dehumidifier_on: bool) -> Optional[datetime]:
+        offset = _next_run_offset(mask, now.hour, dehumidifier_on)
+        if offset == 0:
             return now
-
-        for offset in range(1, 25):
-            check_hour = (current_hour + offset) % 24
-            if self.controller.schedule.get(check_hour, False):
-                next_day = now.date() + timedelta(days=1 if check_hour <= current_hour else 0)
-                return datetime.combine(next_day, time(check_hour))
+        if offset > 0:
+            # Timezone-aware: top of the current hour shifted by the offset
+            return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=offset)
         return None
 
 
@@ -242,44 +449,60 @@ class HumidityPredictionSensor(SensorEntity):
 # -----------------------------------------------------------------------------
 
 
-class LearningModelSensor(SensorEntity):
+class LearningModelSensor(FuktstyrningSensor):
     """Expose the raw learning model as attributes for diagnostics."""
 
-    _attr_has_entity_name = True
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_icon = "mdi:brain"
+    _attr_name = "Dehumidifier Learning Model"
+    _unique_id_suffix = "learning_model"
+
+    def __init__(
+        self,
+        coordinator: FuktstyrningCoordinator,
+        entry: ConfigEntry,
+        controller,
+        device_info: DeviceInfo,
+        unique_id_prefix: str,
+    ):
+        super().__init__(coordinator, entry, controller, device_info, unique_id_prefix)
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, controller):
-        self.hass = hass
-        self.entry = entry
-        self.controller = controller
-
-        self._attr_unique_id = f"{entry.entry_id}_learning_model"
-        self._attr_name = "Dehumidifier Learning Model"
         self._attr_native_value = "learning"
         self._attr_extra_state_attributes: Dict[str, Any] = {}
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name="Fuktstyrning Dehumidifier Controller",
-            manufacturer="Fuktstyrning",
-            model="Smart Dehumidifier Control",
-        )
-
-    async def async_update(self) -> None:  # type: ignore[override]
-        try:
-            model_data = self.controller.learning_module.get_current_model()
-            self._attr_extra_state_attributes = {
-                "data_points": model_data.get("data_points"),
-                "time_to_reduce": model_data.get("time_to_reduce"),
-                "time_to_increase": model_data.get("time_to_increase"),
-                "weather_impact": model_data.get("weather_impact"),
-                "temp_impact": model_data.get("temp_impact"),
-            }
-            self._attr_native_value = f"{model_data.get('data_points', 0)} pts"
-        except KeyError as exc:
-            _LOGGER.error("LearningModelSensor update error due to missing key: %s", exc)
-        except Exception as exc:  # pylint: disable=broad-except
-            _LOGGER.error("Unexpected error updating LearningModelSensor: %s", exc)
+        # Model version the table summary was built for
+        self._model_version: int | None = None
+
+    def _update_from_snapshot(self, data: FuktstyrningSnapshot) -> bool:
+        model_data = data.model
+        if model_data is None:
+            return False
+        data_points = model_data.get("data_points")
+        if (
+            data.model_version == self._model_version
+            and data_points == self._attr_extra_state_attributes.get("data_points")
+        ):
+            return False
+
+        # Table sizes only change with the model version; between analyses
+        # only the data point count moves
+        if data.model_version != self._model_version:
+            # Summary only: the full tables would be copied into every state
+            # change and recorder row. Use fuktstyrning.get_learning_model for them.
+            self._attr_extra_state_attributes.update(
+                {
+                    "data_points": data_points,
+                    "model_version": data.model_version,
+                    "buckets_ttr": len(model_data.get("time_to_reduce") or ()),
+                    "buckets_tti": len(model_data.get("time_to_increase") or ()),
+                    "weather_impact_keys": len(model_data.get("weather_impact") or ()),
+                    "temp_impact_keys": len(model_data.get("temp_impact") or ()),
+                }
+            )
+            self._model_version = data.model_version
+        else:
+            self._attr_extra_state_attributes["data_points"] = data_points
+        self._attr_native_value = f"{model_data.get('data_points', 0)} pts"
+        return True
 
 
 # -----------------------------------------------------------------------------
@@ -287,69 +510,47 @@ class LearningModelSensor(SensorEntity):
 # -----------------------------------------------------------------------------
 
 
-class DewPointSensor(SensorEntity):
+class DewPointSensor(FuktstyrningSensor):
     """Sensor that calculates the dew point based on temperature and humidity."""
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:water-thermometer"
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = "°C"
-    
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, controller):
-        self.hass = hass
-        self.entry = entry
-        self.controller = controller
-        
-        # Använd primära fukt- och temperatursensorn från konfigurationen
-        # Temperatursensorn är ofta samma som fuktsensorn (Aqara T1 rapporterar båda)
-        self._humidity_entity = entry.data.get(CONF_HUMIDITY_SENSOR, "sensor.aqara_t1_innerst_luftfuktighet")
-        self._temperature_entity = entry.data.get(CONF_HUMIDITY_SENSOR, "sensor.aqara_t1_innerst_temperatur")
-        
-        self._attr_unique_id = f"{entry.entry_id}_{SENSOR_DEW_POINT_UNIQUE_ID}"
-        self._attr_name = SENSOR_DEW_POINT_NAME
-        self._attr_native_value = None
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name="Fuktstyrning Dehumidifier Controller",
-            manufacturer="Fuktstyrning",
-            model="Smart Dehumidifier Control",
-        )
+    _attr_name = SENSOR_DEW_POINT_NAME
+    _unique_id_suffix = SENSOR_DEW_POINT_UNIQUE_ID
+
+    def __init__(
+        self,
+        coordinator: FuktstyrningCoordinator,
+        entry: ConfigEntry,
+        controller,
+        device_info: DeviceInfo,
+        unique_id_prefix: str,
+    ):
+        super().__init__(coordinator, entry, controller, device_info, unique_id_prefix)
 
-    async def async_update(self) -> None:
-        """Update the dew point calculation."""
+        self._attr_native_value = None
+        # (humidity, temperature) the current value was computed from
+        self._last_key: tuple | None = None
+
+    def _update_from_snapshot(self, data: FuktstyrningSnapshot) -> bool:
+        humidity = data.humidity
+        temperature = data.temperature
+        if humidity is None or temperature is None:
+            return False
+
+        # Dew point only depends on these two readings
+        key = (humidity, temperature)
+        if key == self._last_key:
+            return False
         try:
-            # Get humidity
-            humidity_state = self.hass.states.get(self._humidity_entity)
-            if not humidity_state or humidity_state.state in ("unknown", "unavailable"):
-                return
-                
-            # Get temperature
-            temp_state = self.hass.states.get(self._temperature_entity)
-            if not temp_state or temp_state.state in ("unknown", "unavailable"):
-                return
-                
-            try:
-                humidity = float(humidity_state.state)
-                temperature = float(temp_state.state)
-            except ValueError:
-                return
-                
-            # Calculate dew point using Magnus-Tetens approximation
-            alpha = 17.27
-            beta = 237.7  # °C
-            
-            # Calculate gamma term
-            gamma = (alpha * temperature) / (beta + temperature) + math.log(humidity / 100.0)
-            
-            # Calculate dew point
-            dew_point = (beta * gamma) / (alpha - gamma)
-            
-            self._attr_native_value = round(dew_point, 1)
-        except (ValueError, TypeError, ZeroDivisionError) as exc:
+            self._attr_native_value = round(dew_point(temperature, humidity), 1)
+        except (ValueError, ZeroDivisionError) as exc:
             _LOGGER.error("DewPointSensor calculation error: %s", exc)
-        except Exception as exc:  # pylint: disable=broad-except
-            _LOGGER.error("Unexpected error updating DewPointSensor: %s", exc)
+            return False
+        self._last_key = key
+        return True
 
 
 # -----------------------------------------------------------------------------
@@ -357,70 +558,50 @@ class DewPointSensor(SensorEntity):
 # -----------------------------------------------------------------------------
 
 
-class PowerSensor(SensorEntity):
+class PowerSensor(FuktstyrningSensor):
     """Sensor that tracks power usage of the dehumidifier."""
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:flash"
     _attr_device_class = SensorDeviceClass.POWER
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = "W"
-    
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, controller):
-        self.hass = hass
-        self.entry = entry
-        self.controller = controller
-        
-        # Använd effektsensorn från konfigurationen
-        self._power_entity = entry.data.get(CONF_POWER_SENSOR, "sensor.lumi_lumi_plug_maeu01_active_power")
-        # Energisensor för effektivitetsberäkningar
-        self._energy_sensor = entry.data.get(CONF_ENERGY_SENSOR, None)
-        
-        self._attr_unique_id = f"{entry.entry_id}_{SENSOR_POWER_UNIQUE_ID}"
-        self._attr_name = SENSOR_POWER_NAME
+    _attr_name = SENSOR_POWER_NAME
+    _unique_id_suffix = SENSOR_POWER_UNIQUE_ID
+
+    def __init__(
+        self,
+        coordinator: FuktstyrningCoordinator,
+        entry: ConfigEntry,
+        controller,
+        device_info: DeviceInfo,
+        unique_id_prefix: str,
+    ):
+        super().__init__(coordinator, entry, controller, device_info, unique_id_prefix)
+
         self._attr_native_value = None
         self._attr_extra_state_attributes = {
             ATTR_ENERGY_EFFICIENCY: None,
         }
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name="Fuktstyrning Dehumidifier Controller",
-            manufacturer="Fuktstyrning",
-            model="Smart Dehumidifier Control",
-        )
+        # (power, energy, model version) behind the published state
+        self._last_sig: tuple | None = None
 
-    async def async_update(self) -> None:
-        """Update the power usage."""
-        try:
-            # Get current power
-            if self._power_entity:
-                power_state = self.hass.states.get(self._power_entity)
-                if power_state and power_state.state not in ("unknown", "unavailable"):
-                    try:
-                        power = float(power_state.state)
-                        self._attr_native_value = power
-                    except ValueError:
-                        pass
-                
-            # Add efficiency data if available
-            model = self.controller.learning_module.get_current_model()
-            if "energy_efficiency" in model:
-                self._attr_extra_state_attributes[ATTR_ENERGY_EFFICIENCY] = model["energy_efficiency"]
-                
-            # Add energy data if available
-            if self._energy_sensor:
-                energy_state = self.hass.states.get(self._energy_sensor)
-                if energy_state and energy_state.state not in ("unknown", "unavailable"):
-                    try:
-                        energy = float(energy_state.state)
-                        self._attr_extra_state_attributes[ATTR_ENERGY_USED] = energy
-                    except ValueError:
-                        pass
-                
-        except (ValueError, TypeError, KeyError) as exc:
-            _LOGGER.error("PowerSensor update error: %s", exc)
-        except Exception as exc:  # pylint: disable=broad-except
-            _LOGGER.error("Unexpected error updating PowerSensor: %s", exc)
+    def _update_from_snapshot(self, data: FuktstyrningSnapshot) -> bool:
+        sig = (data.power, data.energy, data.model_version)
+        if sig == self._last_sig:
+            return False
+        self._last_sig = sig
+
+        if data.power is not None:
+            self._attr_native_value = data.power
+
+        # Add efficiency data
+        if data.model is not None:
+            self._attr_extra_state_attributes[ATTR_ENERGY_EFFICIENCY] = data.model.get("energy_efficiency")
+
+        # Add energy data if available
+        if data.energy is not None:
+            self._attr_extra_state_attributes[ATTR_ENERGY_USED] = data.energy
+        return True
 
 
 # -----------------------------------------------------------------------------
@@ -428,27 +609,29 @@ class PowerSensor(SensorEntity):
 # -----------------------------------------------------------------------------
 
 
-class GroundStateSensor(SensorEntity):
+class GroundStateSensor(FuktstyrningSensor):
     """Sensor that indicates ground dryness state."""
 
-    _attr_has_entity_name = True
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_icon = "mdi:water-percent"
+    _attr_name = SENSOR_GROUND_STATE_NAME
+    _unique_id_suffix = SENSOR_GROUND_STATE_UNIQUE_ID
+
+    def __init__(
+        self,
+        coordinator: FuktstyrningCoordinator,
+        entry: ConfigEntry,
+        controller,
+        device_info: DeviceInfo,
+        unique_id_prefix: str,
+    ):
+        super().__init__(coordinator, entry, controller, device_info, unique_id_prefix)
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, controller):
-        self.hass = hass
-        self.entry = entry
-        self.controller = controller
-        self._attr_unique_id = f"{entry.entry_id}_{SENSOR_GROUND_STATE_UNIQUE_ID}"
-        self._attr_name = SENSOR_GROUND_STATE_NAME
         self._attr_native_value: str | None = None
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name="Fuktstyrning Dehumidifier Controller",
-            manufacturer="Fuktstyrning",
-            model="Smart Dehumidifier Control",
-        )
 
-    async def async_update(self) -> None:
+    def _update_from_snapshot(self, data: FuktstyrningSnapshot) -> bool:
         """Update ground state based on controller classification."""
-        self._attr_native_value = self.controller.ground_state
+        if data.ground_state == self._attr_native_value:
+            return False
+        self._attr_native_value = data.ground_state
+        return True
@@ -7,13 +7,14 @@ API is missing.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Callable, Set
+from typing import Callable, Dict, List, Set
 
 import voluptuous as vol
 from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.config_entries import ConfigEntry
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import entity_registry as er
 
 from .const import (
     DOMAIN,
@@ -21,16 +22,42 @@ from .const import (
     SERVICE_RESET_COST_SAVINGS,
     SERVICE_SET_MAX_HUMIDITY,
     SERVICE_LEARNING_RESET,
+    SERVICE_GET_LEARNING_MODEL,
     CONF_MAX_HUMIDITY,
     ATTR_ENTITY_ID,
     SMART_SWITCH_UNIQUE_ID,
+    DATA_ENTITY_INDEX,
+    DATA_CONTROLLERS,
 )
 
+from .coordinator import read_float
+
 _LOGGER = logging.getLogger(__name__)
 
+try:
+    # Service responses (HA 2023.7+)
+    from homeassistant.core import ServiceResponse, SupportsResponse
+    HAS_SERVICE_RESPONSE = True
+except ImportError:
+    HAS_SERVICE_RESPONSE = False
+
 # -----------------------------------------------------------------------------
 # Back‑compat: resolve helpers for entity‑target extraction
 # -----------------------------------------------------------------------------
+
+
+async def _minimal_extract(
+    hass: HomeAssistant, call: ServiceCall, _: bool = True
+) -> Set[str]:
+    """Very small fallback that just returns the provided entity_id(s)."""
+    ent_id = call.data.get(ATTR_ENTITY_ID)
+    if ent_id is None:
+        return set()
+    if isinstance(ent_id, list):
+        return set(ent_id)
+    return {ent_id}
+
+
 try:
     # New style (≈ 2024.9+) – fat helper module
     from homeassistant.helpers import service as _hass_service  # type: ignore
@@ -46,178 +73,252 @@ except (ImportError, AttributeError):
     ENTITY_SERVICE_SCHEMA = vol.Schema(
         {vol.Required(ATTR_ENTITY_ID): cv.entity_id}
     )  # type: ignore[assignment]
+    async_extract_entity_ids = _minimal_extract
 
-    async def async_extract_entity_ids(
-        hass: HomeAssistant, call: ServiceCall, _: bool = True
-    ) -> Set[str]:
-        """Very small fallback that just returns the provided entity_id(s)."""
-        ent_id = call.data.get(ATTR_ENTITY_ID)
-        if ent_id is None:
-            return set()
-        if isinstance(ent_id, list):
-            return set(ent_id)
-        return {ent_id}
+# Entity id suffixes resolved before the entity index knows the entity
+_FALLBACK_SUFFIXES = (SMART_SWITCH_UNIQUE_ID, "cost_savings")
+
+# -----------------------------------------------------------------------------
+# Service schemas, built once at import
+# -----------------------------------------------------------------------------
+
+_SET_MAX_HUMIDITY_SCHEMA = ENTITY_SERVICE_SCHEMA.extend(
+    {
+        vol.Required(CONF_MAX_HUMIDITY): vol.All(
+            vol.Coerce(float), vol.Range(min=50, max=90)
+        )
+    }
+)
+
+# learning_reset / get_learning_model: optionally limited to one config entry
+_ENTRY_ID_SCHEMA = vol.Schema({
+    vol.Optional("entry_id"): cv.string,
+})
 
 # -----------------------------------------------------------------------------
 # Service registration entry point
 # -----------------------------------------------------------------------------
 
 
-async def async_register_services(
-    hass: HomeAssistant, entry: ConfigEntry, controller
-) -> None:
-    """Register all custom services for Fuktstyrning."""
+async def async_register_services(hass: HomeAssistant) -> None:
+    """Register all custom services for Fuktstyrning.
+
+    The services are domain-wide and resolve their target controller per
+    call, so they are registered once from async_setup.
+    """
+    if hass.services.has_service(DOMAIN, SERVICE_UPDATE_SCHEDULE):
+        return
+
+    # Resolved once; the handlers read it from the enclosing scope
+    extract_entity_ids = async_extract_entity_ids
 
     # ---------------------------------------------------------------------
     # Helper to resolve which controller instance owns a given entity
     # ---------------------------------------------------------------------
 
-    def get_controller(entity_id: str):
-        for data in hass.data.get(DOMAIN, {}).values():
-            ctrl = data.get("controller")
-            if not ctrl:
+    def resolve_controllers(entity_ids: Set[str]) -> Dict:
+        """Map each targeted controller to the first entity_id naming it."""
+        # Physical switch and every entity of the integration are indexed,
+        # so one set intersection resolves almost every target
+        index = hass.data.get(DATA_ENTITY_INDEX, {})
+        owned = entity_ids & index.keys()
+        controllers: Dict = {}
+        for eid in owned:
+            controllers.setdefault(index[eid], eid)
+        rest = entity_ids - owned
+        if not rest:
+            return controllers
+
+        by_entry = hass.data.get(DATA_CONTROLLERS, {})
+        registry = er.async_get(hass)
+        missing = []
+        ambiguous = []
+        for eid in rest:
+            # Entities created by the integration belong to its config entry
+            reg_entry = registry.async_get(eid)
+            ctrl = by_entry.get(reg_entry.config_entry_id) if reg_entry else None
+            # Early-boot race before entities are registered: smart-switch
+            # or cost sensor ids can only be attributed when there is a
+            # single controller; with several, guessing could hit the wrong one
+            if ctrl is None and eid.endswith(_FALLBACK_SUFFIXES):
+                if len(by_entry) == 1:
+                    ctrl = next(iter(by_entry.values()))
+                elif by_entry:
+                    ambiguous.append(eid)
+                    continue
+            if ctrl is None:
+                missing.append(eid)
                 continue
-            # Match physical switch, smart-control switch or cost savings sensor
-            if (
-                # Fysisk väggplugg (direktstyrning)
-                ctrl.dehumidifier_switch == entity_id
-                # Logisk smart‑switch (sätts så fort switch‑plattformen laddas)
-                or ctrl.smart_switch_entity_id == entity_id
-                # Fallback om tjänsten hinner gå innan raden ovan är satt
-                or entity_id.endswith(SMART_SWITCH_UNIQUE_ID)
-                # Kost‑sensor
-                or entity_id.endswith("cost_savings")
-            ):
-                return ctrl
-        return None
+            controllers.setdefault(ctrl, eid)
+        if missing:
+            _LOGGER.error("Could not find controller for %s", ", ".join(sorted(missing)))
+        if ambiguous:
+            _LOGGER.error(
+                "Skipping %s: matches %d controllers, target a specific entity instead",
+                ", ".join(sorted(ambiguous)), len(by_entry),
+            )
+        return controllers
+
+    def select_controllers(entry_id: str | None) -> List:
+        """Return ``(entry_id, controller)`` for one entry if given, else for all."""
+        controllers = hass.data.get(DATA_CONTROLLERS, {})
+        if entry_id:
+            ctrl = controllers.get(entry_id)
+            return [(entry_id, ctrl)] if ctrl is not None else []
+        return list(controllers.items())
+
+    async def run_concurrently(service: str, controllers: Dict, action) -> List[str]:
+        """Run ``action(ctrl, eid)`` for all controllers at once.
+
+        Failures are logged; the entity_ids that succeeded are returned.
+        """
+        results = await asyncio.gather(
+            *(action(ctrl, eid) for ctrl, eid in controllers.items()),
+            return_exceptions=True,
+        )
+        done = []
+        for eid, result in zip(controllers.values(), results):
+            if isinstance(result, Exception):
+                _LOGGER.error("%s failed for %s: %s", service, eid, result)
+            else:
+                done.append(eid)
+        return done
 
     # ------------------------------------------------------------------
     # Individual service handlers
     # ------------------------------------------------------------------
 
     async def handle_update_schedule(call: ServiceCall) -> None:
-        entity_ids = await async_extract_entity_ids(hass, call)
+        entity_ids = await extract_entity_ids(hass, call)
         if not entity_ids:
             _LOGGER.warning("No entity_id provided to update_schedule call")
-        for eid in entity_ids:
-            ctrl = get_controller(eid)
-            if ctrl is None:
-                _LOGGER.error("Could not find controller for %s", eid)
-                continue
+            return
+
+        async def update(ctrl, eid) -> None:
             await ctrl._create_daily_schedule()
-            _LOGGER.info("Manually updated schedule for %s", eid)
+
+        done = await run_concurrently(SERVICE_UPDATE_SCHEDULE, resolve_controllers(entity_ids), update)
+        if done:
+            _LOGGER.info("Manually updated schedule for %s", ", ".join(done))
 
     async def handle_reset_cost_savings(call: ServiceCall) -> None:
-        entity_ids = await async_extract_entity_ids(hass, call)
+        entity_ids = await extract_entity_ids(hass, call)
         if not entity_ids:
             _LOGGER.warning("No entity_id provided to reset_cost_savings call")
-        for eid in entity_ids:
-            ctrl = get_controller(eid)
-            if ctrl is None:
-                _LOGGER.error("Could not find controller for %s", eid)
-                continue
+            return
+        controllers = resolve_controllers(entity_ids)
+        for ctrl in controllers:
             ctrl.cost_savings = 0
-            _LOGGER.info("Reset cost savings for %s", eid)
+        if controllers:
+            _LOGGER.info("Reset cost savings for %s", ", ".join(controllers.values()))
 
     async def handle_set_max_humidity(call: ServiceCall) -> None:
-        entity_ids = await async_extract_entity_ids(hass, call)
+        entity_ids = await extract_entity_ids(hass, call)
         max_humidity = call.data[CONF_MAX_HUMIDITY]
         if not entity_ids:
             _LOGGER.warning("No entity_id provided to set_max_humidity call")
-        for eid in entity_ids:
-            ctrl = get_controller(eid)
-            if ctrl is None:
-                _LOGGER.error("Could not find controller for %s", eid)
-                continue
-            ctrl.max_humidity = max_humidity
-            # Regenerate daily schedule with new max humidity
-            await ctrl._create_daily_schedule()
-            _LOGGER.info("Set max humidity to %s%% and regenerated schedule for %s", max_humidity, eid)
-            # Immediate override check based on new threshold
-            humid_state = ctrl.hass.states.get(ctrl.humidity_sensor)
-            if humid_state and humid_state.state not in ("unknown", "unavailable"):
-                try:
-                    current_h = float(humid_state.state)
-                    if current_h >= ctrl.max_humidity:
-                        await ctrl._turn_on_dehumidifier()
-                        ctrl.override_active = True
-                        _LOGGER.debug("Override activated after max_humidity change (%s%%)", current_h)
-                    elif ctrl.override_active and current_h < ctrl.max_humidity - 5:
-                        await ctrl._turn_off_dehumidifier()
-                        ctrl.override_active = False
-                        _LOGGER.debug("Override deactivated after max_humidity change (%s%%)", current_h)
-                except (ValueError, TypeError):
-                    _LOGGER.warning("Humidity sensor state not numeric during max_humidity service: %s", humid_state.state)
+            return
+
+        # entity_ids whose controller actually rebuilt its schedule
+        rebuilt: List[str] = []
+
+        async def apply(ctrl, eid) -> None:
+            if ctrl.max_humidity == max_humidity:
+                # Same threshold: the schedule is already based on it, but the
+                # override check below still runs so a resend re-triggers control
+                _LOGGER.debug("Max humidity for %s already %s%%, keeping schedule", eid, max_humidity)
+            else:
+                ctrl.max_humidity = max_humidity
+                # Regenerate daily schedule with new max humidity
+                await ctrl._create_daily_schedule()
+                rebuilt.append(eid)
+            # Immediate override check based on new threshold; read once after
+            # the rebuild since another call may have changed it meanwhile
+            humidity_sensor = ctrl.humidity_sensor
+            limit = ctrl.max_humidity
+            current_h = read_float(ctrl.hass, humidity_sensor)
+            if current_h is None:
+                _LOGGER.debug("Humidity sensor %s has no numeric state, skipping override check", humidity_sensor)
+                return
+            if current_h >= limit:
+                await ctrl._turn_on_dehumidifier()
+                ctrl.override_active = True
+                _LOGGER.debug("Override activated after max_humidity change (%s%%)", current_h)
+            elif ctrl.override_active and current_h < limit - 5:
+                await ctrl._turn_off_dehumidifier(current_h)
+                ctrl.override_active = False
+                _LOGGER.debug("Override deactivated after max_humidity change (%s%%)", current_h)
+
+        done = await run_concurrently(SERVICE_SET_MAX_HUMIDITY, resolve_controllers(entity_ids), apply)
+        changed = [eid for eid in done if eid in rebuilt]
+        unchanged = [eid for eid in done if eid not in rebuilt]
+        if changed:
+            _LOGGER.info(
+                "Set max humidity to %s%% and regenerated schedule for %s",
+                max_humidity, ", ".join(changed),
+            )
+        if unchanged:
+            _LOGGER.info(
+                "Max humidity already %s%% for %s, re-checked override only",
+                max_humidity, ", ".join(unchanged),
+            )
 
     async def handle_learning_reset(call: ServiceCall) -> None:
         # Check if a specific entry_id was provided
         entry_id = call.data.get("entry_id")
         
-        # Keep track of how many instances were reset
-        reset_count = 0
-        
-        # Iterate through all registered controllers
-        for config_entry_id, data in hass.data.get(DOMAIN, {}).items():
-            # Skip if entry_id was specified and doesn't match
-            if entry_id and config_entry_id != entry_id:
-                continue
-                
-            ctrl = data.get("controller")
-            if not ctrl:
-                continue
-                
-            # Reset learning data via learning module
-            if hasattr(ctrl, "learning_module") and ctrl.learning_module is not None:
-                await ctrl.learning_module.async_reset()
-                reset_count += 1
-                _LOGGER.info("Reset learning data for config entry %s", config_entry_id)
+        # Reset the requested (or all) learning modules concurrently; each
+        # reset saves to storage
+        targets = select_controllers(entry_id)
+        results = await asyncio.gather(
+            *(ctrl.learning_module.async_reset() for _, ctrl in targets),
+            return_exceptions=True,
+        )
+        reset_entries = []
+        for (config_entry_id, _), result in zip(targets, results):
+            if isinstance(result, Exception):
+                _LOGGER.error("Learning reset failed for config entry %s: %s", config_entry_id, result)
             else:
-                _LOGGER.error("No learning module found for config entry %s", config_entry_id)
+                reset_entries.append(config_entry_id)
         
-        if reset_count == 0:
+        if not reset_entries:
             if entry_id:
                 _LOGGER.warning("No matching learning module found for entry_id: %s", entry_id)
             else:
                 _LOGGER.warning("No learning modules found to reset")
         else:
-            _LOGGER.info("Reset %d learning module(s)", reset_count)
+            _LOGGER.info(
+                "Reset %d learning module(s): %s", len(reset_entries), ", ".join(reset_entries)
+            )
+
+    async def handle_get_learning_model(call: ServiceCall) -> "ServiceResponse":
+        """Return the full learning tables, which the sensor only summarises."""
+        entry_id = call.data.get("entry_id")
+        models = {}
+        for config_entry_id, ctrl in select_controllers(entry_id):
+            models[config_entry_id] = {
+                **ctrl.learning_module.get_current_model(),
+                "model_version": ctrl.learning_module.model_version,
+            }
+        return {"models": models}
 
     # ------------------------------------------------------------------
-    # Register the four public services
+    # Register the public services
     # ------------------------------------------------------------------
 
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_UPDATE_SCHEDULE,
-        handle_update_schedule,
-        schema=ENTITY_SERVICE_SCHEMA,
-    )
-
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_RESET_COST_SAVINGS,
-        handle_reset_cost_savings,
-        schema=ENTITY_SERVICE_SCHEMA,
-    )
-
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_SET_MAX_HUMIDITY,
-        handle_set_max_humidity,
-        schema=ENTITY_SERVICE_SCHEMA.extend(
-            {
-                vol.Required(CONF_MAX_HUMIDITY): vol.All(
-                    vol.Coerce(float), vol.Range(min=50, max=90)
-                )
-            }
-        ),
-    )
-    
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_LEARNING_RESET,
-        handle_learning_reset,
-        schema=vol.Schema({
-            vol.Optional("entry_id"): cv.string,
-        }),
-    )
+    for name, handler, schema in (
+        (SERVICE_UPDATE_SCHEDULE, handle_update_schedule, ENTITY_SERVICE_SCHEMA),
+        (SERVICE_RESET_COST_SAVINGS, handle_reset_cost_savings, ENTITY_SERVICE_SCHEMA),
+        (SERVICE_SET_MAX_HUMIDITY, handle_set_max_humidity, _SET_MAX_HUMIDITY_SCHEMA),
+        (SERVICE_LEARNING_RESET, handle_learning_reset, _ENTRY_ID_SCHEMA),
+    ):
+        hass.services.async_register(DOMAIN, name, handler, schema=schema)
+
+    if HAS_SERVICE_RESPONSE:
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_LEARNING_MODEL,
+            handle_get_learning_model,
+            schema=_ENTRY_ID_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
@@ -3,7 +3,8 @@ import logging
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.const import (
@@ -18,6 +19,7 @@ from .const import (
     SMART_SWITCH_UNIQUE_ID,
     SWITCH_NAME,
     ATTR_OVERRIDE_ACTIVE,
+    SIGNAL_OVERRIDE_CHANGED,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -43,6 +45,8 @@ class DehumidifierControlSwitch(SwitchEntity):
 
     _attr_has_entity_name = True
     _attr_icon = "mdi:dehumidifier"
+    # The controller signals override changes; nothing to poll
+    _attr_should_poll = False
 
     def __init__(self, hass, entry, controller):
         """Initialize the switch."""
@@ -61,6 +65,20 @@ class DehumidifierControlSwitch(SwitchEntity):
         await super().async_added_to_hass()
         # Record this entity id for service resolution
         self.controller.smart_switch_entity_id = self.entity_id
+        self._attr_extra_state_attributes[ATTR_OVERRIDE_ACTIVE] = self.controller.override_active
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_OVERRIDE_CHANGED.format(self.entry.entry_id),
+                self._async_override_changed,
+            )
+        )
+
+    @callback
+    def _async_override_changed(self) -> None:
+        """Publish the controller's new override flag."""
+        self._attr_extra_state_attributes[ATTR_OVERRIDE_ACTIVE] = self.controller.override_active
+        self.async_write_ha_state()
 
     @property
     def is_on(self) -> bool:
@@ -83,7 +101,3 @@ class DehumidifierControlSwitch(SwitchEntity):
             "switch", SERVICE_TURN_OFF, {ATTR_ENTITY_ID: self.controller.dehumidifier_switch}
         )
         self.async_write_ha_state()
-
-    async def async_update(self) -> None:
-        """Update the switch state."""
-        self._attr_extra_state_attributes[ATTR_OVERRIDE_ACTIVE] = self.controller.override_active
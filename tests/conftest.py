@@ -0,0 +1,69 @@
+"""Shared test helpers for Fuktstyrning."""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.helpers.storage import Store
+
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+
+if HAS_UVLOOP:
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop, whose loop setup and scheduling are cheaper."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _patch_store():
+    """Keep every Store in memory: loads find nothing, saves are dropped."""
+    patches = (
+        patch.object(Store, "async_save", new=AsyncMock(return_value=None)),
+        patch.object(Store, "async_load", new=AsyncMock(return_value=None)),
+    )
+    for p in patches:
+        p.start()
+    yield
+    for p in patches:
+        p.stop()
+
+
+def _make_state(value, **attrs):
+    """Return a minimal stand-in for a Home Assistant State.
+
+    The integration only reads ``.state`` and ``.attributes``, so a plain
+    namespace is enough and far cheaper than a MagicMock per state.
+    """
+    return SimpleNamespace(state=value, attributes=attrs)
+
+
+@pytest.fixture
+def make_state():
+    """Provide the State stand-in factory."""
+    return _make_state
+
+
+@pytest.fixture
+def make_controller():
+    """Provide a factory for real controllers on a stand-in hass.
+
+    Construction only touches ``hass.data`` and ``hass.config.path``; pass
+    an earlier controller's ``hass`` to share it, and add states or services
+    to it where a test needs them.
+    """
+    # Imported lazily: only the tests using this fixture need the controller
+    from custom_components.fuktstyrning.controller import FuktstyrningController
+
+    def _make_controller(entry_id="entry", hass=None, **data):
+        if hass is None:
+            hass = SimpleNamespace(data={}, config=SimpleNamespace(path=lambda *parts: "/config"))
+        entry = SimpleNamespace(entry_id=entry_id, data=data, options={})
+        return FuktstyrningController(hass, entry)
+
+    return _make_controller
@@ -0,0 +1,22 @@
+from custom_components.fuktstyrning.const import DATA_CONTROLLERS, DATA_ENTITY_INDEX
+
+
+def test_register_and_release(make_controller):
+    controller = make_controller("a", dehumidifier_switch="switch.dehumidifier")
+    hass = controller.hass
+    other = make_controller("b", hass, dehumidifier_switch="switch.other")
+
+    # Nothing is resolvable before setup has finished
+    assert hass.data[DATA_ENTITY_INDEX] == {}
+    assert hass.data[DATA_CONTROLLERS] == {}
+
+    controller.register()
+    other.register()
+    controller.index_entity("sensor.cost_savings")
+    assert hass.data[DATA_CONTROLLERS] == {"a": controller, "b": other}
+
+    controller.release()
+    assert hass.data[DATA_CONTROLLERS] == {"b": other}
+    assert hass.data[DATA_ENTITY_INDEX] == {"switch.other": other}
+    # Safe to call again, e.g. after a failed setup that then unloads
+    controller.release()
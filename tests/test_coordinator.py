@@ -0,0 +1,74 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.fuktstyrning.coordinator import FuktstyrningCoordinator
+
+
+@pytest.fixture
+def controller():
+    ctrl = MagicMock()
+    ctrl.humidity_sensor = "sensor.humidity"
+    ctrl.price_sensor = "sensor.price"
+    ctrl.dehumidifier_switch = "switch.dehumidifier"
+    ctrl.power_sensor = "sensor.power"
+    ctrl.energy_sensor = None
+    ctrl.schedule = {3: True}
+    ctrl.schedule_mask = 1 << 3
+    ctrl.schedule_created_date = None
+    ctrl.cost_savings = 1.5
+    ctrl.ground_state = "Neutral"
+    ctrl._get_price_forecast.return_value = [0.8, 0.3, 0.5]
+    ctrl.learning_module.get_current_model.return_value = {"data_points": 0}
+    ctrl.learning_module.model_version = 2
+    return ctrl
+
+
+@pytest.mark.asyncio
+async def test_snapshot_reads_sources_once(controller, make_state):
+    states = {
+        "sensor.humidity": make_state("68.5"),
+        "sensor.price": make_state("unavailable"),
+        "switch.dehumidifier": make_state("on"),
+        "sensor.temperature": make_state("12"),
+    }
+    # spec keeps unexpected attribute access from silently creating child mocks
+    hass = MagicMock(spec=HomeAssistant)
+    hass.states = SimpleNamespace(get=states.get)
+    entry = MagicMock()
+    entry.data = {"temperature_sensor": "sensor.old"}
+    # A sensor picked in the options flow replaces the one from setup
+    entry.options = {"temperature_sensor": "sensor.temperature"}
+
+    coordinator = FuktstyrningCoordinator(hass, entry, controller)
+    data = await coordinator._async_update_data()
+
+    assert data.humidity == 68.5
+    assert data.temperature == 12.0
+    assert data.current_price is None
+    assert data.power is None
+    assert data.optimal_price == 0.3
+    assert data.dehumidifier_on is True
+    assert data.schedule_mask == 8
+    assert data.model_version == 2
+
+
+@pytest.mark.asyncio
+async def test_snapshot_survives_bad_inputs(controller, make_state):
+    # Nordpool may publish today's prices as a comma-separated string
+    states = {"sensor.price": make_state("0.5", today="0.25, 0.5, 0.75, n/a")}
+    controller.learning_module.get_current_model.side_effect = KeyError("time_to_reduce")
+    hass = MagicMock(spec=HomeAssistant)
+    hass.states = SimpleNamespace(get=states.get)
+    entry = MagicMock()
+    entry.data = {}
+    entry.options = {}
+
+    coordinator = FuktstyrningCoordinator(hass, entry, controller)
+    data = await coordinator._async_update_data()
+
+    assert data.average_price_today == 0.5
+    assert data.current_price == 0.5
+    assert data.model is None
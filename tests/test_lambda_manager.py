@@ -1,36 +1,52 @@
 """Unit tests for lambda_manager.py."""
 import asyncio
+import copy
 import pytest
-from unittest.mock import MagicMock, AsyncMock, patch
+from types import SimpleNamespace
 from datetime import datetime, timedelta
 
 import homeassistant.util.dt as dt_util
-from homeassistant.helpers.storage import Store
 
 from custom_components.fuktstyrning.lambda_manager import LambdaManager
 
-# Mocks
-async def mock_save(*args, **kwargs):
-    """Mock for async_save."""
-    return None
+# 25 samples four hours apart, oldest first like record_max_humidity appends them
+_WINDOW_DELTAS = tuple(timedelta(hours=i*4) for i in reversed(range(25)))
+
+
+def _humidity_window(now, humidity, max_humidity=70.0):
+    """Build window samples the way record_max_humidity stores them, in time order."""
+    return [
+        {"timestamp": (now - delta).isoformat(), "humidity": humidity, "max": max_humidity}
+        for delta in _WINDOW_DELTAS
+    ]
 
 # Test setup
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_hass():
     """Provide hass fixture."""
-    hass = MagicMock()
-    hass.async_create_task = lambda task: asyncio.create_task(task)
-    return hass
+    # LambdaManager only publishes its sensor state and schedules tasks
+    return SimpleNamespace(
+        states=SimpleNamespace(async_set=lambda *args, **kwargs: None),
+        async_create_task=asyncio.create_task,
+    )
 
-@pytest.fixture
-async def lambda_manager(mock_hass):
-    """Create lambda manager fixture with mocked storage."""
+@pytest.fixture(scope="session")
+async def _initialized_lambda_manager(mock_hass):
+    """Run async_init once per session; Store is patched in conftest."""
     manager = LambdaManager()
-    
-    # Patcha Store för att inte faktiskt spara till disk
-    with patch.object(Store, 'async_save', new=AsyncMock(side_effect=mock_save)), \
-         patch.object(Store, 'async_load', new=AsyncMock(return_value=None)):
-        await manager.async_init(mock_hass, 0.5)  # Sätt initial_lambda till 0.5
+    await manager.async_init(mock_hass, 0.5)  # Sätt initial_lambda till 0.5
+    return manager
+
+@pytest.fixture
+def now():
+    """Provide the reference time the test data is laid out from."""
+    return dt_util.now()
+
+@pytest.fixture
+def lambda_manager(_initialized_lambda_manager):
+    """Give each test its own copy of the initialized lambda manager."""
+    manager = copy.copy(_initialized_lambda_manager)
+    manager._lock = asyncio.Lock()
     
     # Reset för tydligare test
     manager._events = []
@@ -46,22 +62,17 @@ async def test_lambda_init(lambda_manager):
     assert lambda_manager._initial_lambda == 0.5
 
 @pytest.mark.asyncio
-async def test_lambda_increase_with_overflows(lambda_manager):
+async def test_lambda_increase_with_overflows(lambda_manager, now):
     """Test that lambda increases when enough overflow events occur."""
     # Lägg till 4 overflow-händelser
-    now = dt_util.now()
-    
-    for i in range(4):
-        event_time = now - timedelta(hours=i*6)  # Jämnt fördelade över de senaste dagarna
-        await lambda_manager.record_event(overflow=True)
-        # Manipulera timestamp för testsyften
-        lambda_manager._events[-1]["timestamp"] = event_time.isoformat()
+    # Jämnt fördelade över de senaste dagarna, i samma format och ordning som record_event
+    lambda_manager._events.extend(
+        {"timestamp": (now - timedelta(hours=i*6)).isoformat(), "overflow": True}
+        for i in reversed(range(4))
+    )
     
-    # Lägg till mock-fuktdata för att passera datakraven
-    for i in range(25):
-        event_time = now - timedelta(hours=i*4)
-        await lambda_manager.record_max_humidity(50.0, 70.0)  # Alltid under gränsen
-        lambda_manager._max_humidity_window[-1]["timestamp"] = event_time.isoformat()
+    # Lägg till mock-fuktdata för att passera datakraven (alltid under gränsen)
+    lambda_manager._max_humidity_window = _humidity_window(now, 50.0)
     
     # Kör veckovis justering
     await lambda_manager.weekly_adjust()
@@ -70,18 +81,14 @@ async def test_lambda_increase_with_overflows(lambda_manager):
     assert lambda_manager.get_lambda() == pytest.approx(0.55, abs=0.01)
 
 @pytest.mark.asyncio
-async def test_lambda_decrease_when_safe(lambda_manager):
+async def test_lambda_decrease_when_safe(lambda_manager, now):
     """Test that lambda decreases when always under threshold."""
-    now = dt_util.now()
-    
-    # Lägg till tillräckligt med data som alltid är under gränsen
-    for i in range(25):
-        event_time = now - timedelta(hours=i*4)  # Jämnt fördelade över senaste dagarna
-        await lambda_manager.record_max_humidity(65.0, 70.0)  # 5% under max
-        lambda_manager._max_humidity_window[-1]["timestamp"] = event_time.isoformat()
+    # Lägg till tillräckligt med data som alltid är under gränsen (5% under max),
+    # jämnt fördelade över senaste dagarna
+    lambda_manager._max_humidity_window = _humidity_window(now, 65.0)
     
     # Lägg till något enstaka event, men inte overflow
-    await lambda_manager.record_event(overflow=False)
+    lambda_manager._events.append({"timestamp": now.isoformat(), "overflow": False})
     
     # Kör veckovis justering
     await lambda_manager.weekly_adjust()
@@ -92,27 +99,27 @@ async def test_lambda_decrease_when_safe(lambda_manager):
 @pytest.mark.asyncio
 async def test_lambda_clamp_min_max(lambda_manager):
     """Test that lambda is clamped between min and max values."""
-    # Sätt lambda till nästan min
-    await lambda_manager.set_lambda(0.06)  # Bör bli 0.1*initial = 0.05
-    assert lambda_manager.get_lambda() >= 0.05
-    
-    # Sätt lambda till nästan max
-    await lambda_manager.set_lambda(2.49)  # Bör bli 5*initial = 2.5
-    assert lambda_manager.get_lambda() <= 2.5
-    
-    # Försök överstiga max
-    await lambda_manager.set_lambda(10.0)  # Bör clampas till 2.5
+    # set_lambda tar managerns lås, så samtidiga anrop körs i ordning
+    # och det sista värdet gäller
+    
+    # Nästan min, sedan försök överstiga max
+    await asyncio.gather(
+        lambda_manager.set_lambda(0.06),  # Bör bli 0.1*initial = 0.05
+        lambda_manager.set_lambda(10.0),  # Bör clampas till 5*initial = 2.5
+    )
     assert lambda_manager.get_lambda() == pytest.approx(2.5, abs=0.01)
     
-    # Försök understiga min
-    await lambda_manager.set_lambda(0.01)  # Bör clampas till 0.05
+    # Nästan max, sedan försök understiga min
+    await asyncio.gather(
+        lambda_manager.set_lambda(2.49),
+        lambda_manager.set_lambda(0.01),  # Bör clampas till 0.05
+    )
     assert lambda_manager.get_lambda() >= 0.05
 
 @pytest.mark.asyncio
-async def test_no_adjustment_with_insufficient_data(lambda_manager):
+async def test_no_adjustment_with_insufficient_data(lambda_manager, now):
     """Test that no adjustment is made when there is insufficient data."""
     # Lägg bara till några få datapunkter
-    now = dt_util.now()
     for i in range(5):
         event_time = now - timedelta(hours=i)
         await lambda_manager.record_max_humidity(65.0, 70.0)
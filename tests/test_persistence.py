@@ -1,32 +1,34 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 from custom_components.fuktstyrning.persistence import Persistence
 
 @pytest.fixture
 def mock_hass():
-    return MagicMock()
+    # Persistence only stores hass
+    return SimpleNamespace()
 
 @pytest.fixture
 def controller(mock_hass):
     ctrl = MagicMock()
-    ctrl.learning_module = MagicMock()
+    ctrl.learning_module = MagicMock(
+        load_learning_data=AsyncMock(), save_learning_data=AsyncMock()
+    )
     return ctrl
 
-@pytest.mark.asyncio
-async def test_load_invokes_learning_module(mock_hass, controller):
-    persistence = Persistence(mock_hass, "entry")
-    controller.learning_module.load_learning_data = AsyncMock()
+@pytest.fixture
+def persistence(mock_hass):
+    return Persistence(mock_hass, "entry")
 
+@pytest.mark.asyncio
+async def test_load_invokes_learning_module(persistence, controller):
     await persistence.load(controller)
 
     controller.learning_module.load_learning_data.assert_awaited_once()
 
 @pytest.mark.asyncio
-async def test_save_invokes_learning_module(mock_hass, controller):
-    persistence = Persistence(mock_hass, "entry")
-    controller.learning_module.save_learning_data = AsyncMock()
-
+async def test_save_invokes_learning_module(persistence, controller):
     await persistence.save(controller)
 
     controller.learning_module.save_learning_data.assert_awaited_once()
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from custom_components.fuktstyrning.psychrometrics import dew_point, dew_point_batch
+
+
+def test_dew_point_known_value():
+    # 20 °C at 50 % RH is roughly 9.3 °C dew point
+    assert dew_point(20.0, 50.0) == pytest.approx(9.26, abs=0.05)
+
+
+def test_dew_point_batch_matches_scalar():
+    temps = [5.0, 12.5, 20.0, 27.0]
+    hums = [90.0, 70.0, 50.0, 35.0]
+    result = dew_point_batch(temps, hums)
+    assert result.dtype == np.float32
+    expected = [dew_point(t, h) for t, h in zip(temps, hums)]
+    assert result == pytest.approx(expected, abs=1e-3)
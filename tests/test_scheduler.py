@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.fuktstyrning.scheduler import build_optimized_schedule
+
+# Always a 0 h shift, so the jitter keeps every chosen hour
+_NO_JITTER = SimpleNamespace(choice=lambda seq: 0)
+# Rising price curve; build_optimized_schedule copies it, so a tuple is fine
+_PRICES_24 = tuple(range(24))
+
+
+@pytest.mark.parametrize(
+    "humidity,prices,alpha,expected_on",
+    [
+        # Short forecast is padded to 24 h
+        (75.0, [0.1, 0.2], 0.1, 8),
+        # Rising prices: the cheapest (earliest) hours are chosen
+        (80.0, _PRICES_24, 0.0, 13),
+    ],
+)
+def test_build_schedule(humidity, prices, alpha, expected_on):
+    schedule = build_optimized_schedule(
+        current_humidity=humidity,
+        max_humidity=70.0,
+        price_forecast=prices,
+        reduction_rate=1.0,
+        increase_rate=0.5,
+        alpha=alpha,
+        rng=_NO_JITTER,
+    )
+    assert len(schedule) == 24
+    assert all(isinstance(on, bool) for on in schedule)
+    assert schedule == [h < expected_on for h in range(24)]
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from custom_components.fuktstyrning.sensor import (
+    HumidityPredictionSensor,
+    _bucket_lut,
+    _find_bucket,
+    _parse_buckets,
+)
+
+MODEL = {
+    "time_to_reduce": {"80_to_75": 30, "75_to_70": 45, "70_to_65": 60},
+    "time_to_increase": {"60_to_65": 4.0, "65_to_70": 6.0, "70_to_75": 8.0},
+}
+
+
+def _predict_scalar(model, humidity, on):
+    if on:
+        buckets = _parse_buckets(model["time_to_reduce"], 60.0)
+        bucket = _find_bucket(buckets, _bucket_lut(buckets, True), humidity, True)
+        return humidity if bucket is None else max(bucket[1], humidity - bucket[2])
+    buckets = _parse_buckets(model["time_to_increase"], 1.0)
+    bucket = _find_bucket(buckets, _bucket_lut(buckets, False), humidity, False)
+    return humidity if bucket is None else min(bucket[1], humidity + bucket[2])
+
+
+@pytest.mark.parametrize(
+    "model",
+    [MODEL, {**MODEL, "time_to_reduce": {"80.5_to_75": 30, "75_to_70": 45}}],
+)
+def test_predict_batch_matches_scalar(model):
+    humidities = np.linspace(55.0, 85.0, 121)
+    on_mask = np.arange(humidities.size) % 2 == 0
+    result = HumidityPredictionSensor.predict_batch(model, humidities, on_mask)
+    expected = [_predict_scalar(model, h, on) for h, on in zip(humidities, on_mask)]
+    assert result == pytest.approx(expected)
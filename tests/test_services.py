@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.fuktstyrning import services
+from custom_components.fuktstyrning.const import (
+    DATA_CONTROLLERS,
+    DATA_ENTITY_INDEX,
+    SERVICE_RESET_COST_SAVINGS,
+)
+
+
+class _Controller:
+    """Hashable controller stand-in; the services key their results on it."""
+
+    def __init__(self):
+        self.cost_savings = 5.0
+
+
+@pytest.fixture
+async def reset_cost_savings(monkeypatch):
+    """Register the services on a stand-in hass with two controllers.
+
+    Returns the reset_cost_savings handler, the controllers by entry_id and
+    the hass data the services resolve them from.
+    """
+    controllers = {"a": _Controller(), "b": _Controller()}
+    hass = SimpleNamespace(
+        data={
+            DATA_ENTITY_INDEX: {"switch.dehumidifier_a": controllers["a"]},
+            DATA_CONTROLLERS: dict(controllers),
+        },
+        services=SimpleNamespace(
+            has_service=lambda domain, service: False,
+            async_register=lambda domain, name, handler, **kwargs: handlers.__setitem__(name, handler),
+        ),
+    )
+    handlers = {}
+    # Only sensor.savings_b is registered, to config entry "b"
+    registry = {"sensor.savings_b": SimpleNamespace(config_entry_id="b")}
+    monkeypatch.setattr(services.er, "async_get", lambda hass: SimpleNamespace(async_get=registry.get))
+    monkeypatch.setattr(services, "async_extract_entity_ids", services._minimal_extract)
+
+    await services.async_register_services(hass)
+    return handlers[SERVICE_RESET_COST_SAVINGS], controllers, hass.data
+
+
+@pytest.mark.parametrize(
+    "entity_id,expected_reset",
+    [
+        # Entity index hit
+        ("switch.dehumidifier_a", {"a"}),
+        # Not indexed, resolved through the entity registry
+        ("sensor.savings_b", {"b"}),
+        # Unregistered smart switch id with two controllers: ambiguous, skipped
+        ("switch.fuktstyrning_dehumidifier_smart_control", set()),
+    ],
+)
+async def test_resolve_controllers(reset_cost_savings, entity_id, expected_reset):
+    handler, controllers, _ = reset_cost_savings
+    await handler(SimpleNamespace(data={"entity_id": entity_id}))
+    reset = {entry_id for entry_id, ctrl in controllers.items() if ctrl.cost_savings == 0}
+    assert reset == expected_reset
+
+
+async def test_suffix_fallback_with_single_controller(reset_cost_savings):
+    handler, controllers, data = reset_cost_savings
+    del data[DATA_CONTROLLERS]["b"]
+    await handler(SimpleNamespace(data={"entity_id": "switch.fuktstyrning_dehumidifier_smart_control"}))
+    assert controllers["a"].cost_savings == 0
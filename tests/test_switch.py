@@ -0,0 +1,37 @@
+from unittest.mock import MagicMock
+
+from custom_components.fuktstyrning import controller as controller_module
+from custom_components.fuktstyrning import switch as switch_module
+from custom_components.fuktstyrning.const import ATTR_OVERRIDE_ACTIVE
+from custom_components.fuktstyrning.switch import DehumidifierControlSwitch
+
+
+async def test_override_change_updates_switch(make_controller, monkeypatch):
+    # In-memory dispatcher: signal name -> connected callbacks
+    targets = {}
+
+    def connect(hass, signal, target):
+        targets.setdefault(signal, []).append(target)
+        return lambda: targets[signal].remove(target)
+
+    def send(hass, signal, *args):
+        for target in list(targets.get(signal, ())):
+            target(*args)
+
+    monkeypatch.setattr(switch_module, "async_dispatcher_connect", connect)
+    monkeypatch.setattr(controller_module, "async_dispatcher_send", send)
+
+    controller = make_controller()
+    switch = DehumidifierControlSwitch(controller.hass, controller.entry, controller)
+    switch.entity_id = "switch.smart_control"
+    switch.async_write_ha_state = MagicMock()
+    await switch.async_added_to_hass()
+    assert switch.extra_state_attributes[ATTR_OVERRIDE_ACTIVE] is False
+
+    controller.override_active = True
+    assert switch.extra_state_attributes[ATTR_OVERRIDE_ACTIVE] is True
+    switch.async_write_ha_state.assert_called_once()
+
+    # Setting the same value again sends nothing
+    controller.override_active = True
+    switch.async_write_ha_state.assert_called_once()